@@ -1,45 +1,256 @@
 import random
+import sys
 import time
 import json
+import logging
 import os # For checking file existence
+from bisect import bisect_right
+from functools import lru_cache
+from operator import attrgetter
 
 # --- ANSI Color Codes ---
-class Colors:
-    RESET = '\033[0m'
-    RED = '\033[91m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    MAGENTA = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BRIGHT_BLACK = '\033[90m'
-    BRIGHT_RED = '\033[91m'
-    BRIGHT_GREEN = '\033[92m'
-    BRIGHT_YELLOW = '\033[93m'
-    BRIGHT_BLUE = '\033[94m'
-    BRIGHT_MAGENTA = '\033[95m'
-    BRIGHT_CYAN = '\033[96m'
-    BRIGHT_WHITE = '\033[97m'
+RESET = '\033[0m'
+BRIGHT_BLACK = '\033[90m'
+RED = BRIGHT_RED = '\033[91m'
+GREEN = BRIGHT_GREEN = '\033[92m'
+YELLOW = BRIGHT_YELLOW = '\033[93m'
+BLUE = BRIGHT_BLUE = '\033[94m'
+MAGENTA = BRIGHT_MAGENTA = '\033[95m'
+CYAN = BRIGHT_CYAN = '\033[96m'
+WHITE = BRIGHT_WHITE = '\033[97m'
+
+if not (sys.stdout is not None and sys.stdout.isatty()):
+    # Piped or redirected output gets plain text; every colored string and template below is built from these
+    RESET = BRIGHT_BLACK = RED = BRIGHT_RED = GREEN = BRIGHT_GREEN = YELLOW = BRIGHT_YELLOW = ''
+    BLUE = BRIGHT_BLUE = MAGENTA = BRIGHT_MAGENTA = CYAN = BRIGHT_CYAN = WHITE = BRIGHT_WHITE = ''
+
+# Save/load bookkeeping goes through logging; the default WARNING level keeps routine confirmations off stdout.
+logger = logging.getLogger(__name__)
+
+# --- Combat Tables ---
+
+# Hit-chance modifier for the player's shot, by weapon optimal range, then by location range.
+_RANGE_MOD_ROWS_BY_WEAPON = {
+    "very_short": {"very_short": 0.20, "short": -0.10, "medium": -0.15, "long": -0.30},
+    "short":      {"very_short": 0.10, "short": 0.15, "medium": -0.05, "long": -0.20},
+    "medium":     {"very_short": -0.05, "short": 0.05, "medium": 0.10, "long": -0.10},
+    "long":       {"very_short": -0.15, "short": -0.10, "medium": 0.05, "long": 0.20},
+}
+
+def _make_resolver(weapon_range):
+    """Returns a shot resolver with the modifier row for weapon_range already bound."""
+    row = _RANGE_MOD_ROWS_BY_WEAPON.get(weapon_range, {})
+    def resolve(location_range, base_hit_chance):
+        hit_chance = base_hit_chance + row.get(location_range, 0)
+        if hit_chance < 0.1:
+            hit_chance = 0.1
+        elif hit_chance > 0.95:
+            hit_chance = 0.95
+        return hit_chance
+    return resolve
+
+_HEADSHOT_MISS_PENALTY = 0.30 # Aiming for the head lowers the chance to land the shot at all
+_HEADSHOT_LAND_CHANCE = 0.4 # Chance a shot aimed at the head that lands actually hits the head
+
+def _resolve_shot(hit_chance, aim_head, hit_roll, location_roll):
+    """
+    Resolves where a player's shot lands from two pre-drawn uniform rolls in [0, 1).
+    Returns "head", "body", or None for a miss. Pure arithmetic, no RNG or I/O.
+    """
+    if aim_head:
+        if hit_roll < hit_chance - _HEADSHOT_MISS_PENALTY:
+            return "head" if location_roll < _HEADSHOT_LAND_CHANCE else "body"
+        return None
+    return "body" if hit_roll < hit_chance else None
+
+# Hit-chance modifier for enemy shots, by location range (unlisted ranges are neutral).
+_ENEMY_RANGE_MOD = {"very_short": 0.10, "short": 0.05, "long": -0.10}
+
+def _enemy_hit_chance(base_hit_chance, location_range):
+    """Returns an enemy's clamped hit chance when fighting in a location of the given range."""
+    hit_chance = base_hit_chance + _ENEMY_RANGE_MOD.get(location_range, 0.0)
+    if hit_chance < 0.1:
+        hit_chance = 0.1
+    elif hit_chance > 0.95:
+        hit_chance = 0.95
+    return hit_chance
+
+# Damage multiplier for a head hit on a target without a helmet.
+_PLAYER_BARE_HEAD_MULT = 1.5
+_ENEMY_BARE_HEAD_MULT = 2
+
+def _resolve_damage(amount, defense, bare_head_mult=0):
+    """Returns the damage left after defense, scaled by bare_head_mult (when non-zero) for an unprotected head hit."""
+    effective_damage = amount - defense
+    if effective_damage <= 0:
+        return 0
+    if bare_head_mult:
+        effective_damage = int(effective_damage * bare_head_mult)
+    return effective_damage
+
+# --- Map Directions ---
+
+DIRECTIONS = ("north", "east", "south", "west", "northeast", "northwest", "southeast", "southwest")
+_DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)} # Slot of each direction in Location.exits
+
+# --- Random Helpers ---
+
+# Pre-bound uniform draw for per-hit rolls outside the combat loop's own locals.
+# random.seed() reseeds the same module-level generator, so the binding never goes stale.
+_random = random.random
+
+def _sample_small(pool, k):
+    """Returns k distinct picks from pool as a new list; avoids random.sample's setup cost for k <= 2."""
+    if k == 0:
+        return []
+    n = len(pool)
+    if k == 1:
+        return [pool[random.randrange(n)]]
+    if k == 2:
+        i = random.randrange(n)
+        j = random.randrange(n - 1)
+        if j >= i:
+            j += 1
+        return [pool[i], pool[j]]
+    return random.sample(pool, k)
+
+# --- Input Helpers ---
+
+def _build_prefix_map(options):
+    """
+    Maps every prefix of every option (including "") to the tuple of options it could complete to,
+    in the order given. An option typed in full always resolves to itself, even if it is also a
+    prefix of a longer option (e.g. "north" vs "northeast").
+    """
+    prefix_map = {}
+    for option in options:
+        for length in range(len(option) + 1):
+            prefix_map.setdefault(option[:length], []).append(option)
+    prefix_map = {prefix: tuple(matches) for prefix, matches in prefix_map.items()}
+    for option in options:
+        prefix_map[option] = (option,)
+    return prefix_map
+
+def _confirm(prompt):
+    """Asks a yes/no question; only "yes" (any case, surrounding spaces allowed) confirms."""
+    answer = input(prompt)
+    return answer == "yes" or answer.strip().lower() == "yes" # Plain "yes" skips the normalising copies
+
+def _prompt_choice(prompt, prefix_map, noun, invalid_message):
+    """
+    Asks until the answer completes to exactly one option of prefix_map (from _build_prefix_map)
+    and returns that option. noun names an option in the ambiguity hint ("choice", "direction").
+    """
+    while True:
+        answer = input(prompt).lower().strip()
+        matches = prefix_map.get(answer, ())
+        if len(matches) == 1:
+            print(f"(Autocompleted to: {matches[0]})")
+            return matches[0]
+        if matches:
+            print(f"Ambiguous {noun}. Did you mean: {', '.join(matches)}?")
+        else:
+            print(invalid_message)
+
+# --- Output Helpers ---
+
+def _emit(lines):
+    """Writes the buffered lines to stdout in one call (print-equivalent output) and empties the buffer."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
+# --- Message Templates ---
+# %-format templates for status lines printed every combat round.
+
+_HEALTH_LINE = "Your Health: %s"
+_CONDITION_LINE = "%s (Condition: %s)" # Enemy lines take Enemy.colored_name
+_ENEMY_HIT_LINE = "%s attacks you, dealing %d damage."
+_COUNTER_HIT_LINE = "%s lands a hit on you, dealing %d damage."
+_BLEED_LINE = "You are bleeding, taking %d damage. Your Health: %s"
+
+# Shot outcome lines, keyed on (aimed part, part hit); the %s lines take Enemy.colored_name
+_PLAYER_HIT_LINES = {
+    ("head", "head"): "You aimed for the head and hit the head!",
+    ("head", "body"): "You aimed for the head but hit the body instead!",
+    ("body", "body"): "You aimed for the body and hit the body!",
+}
+_PLAYER_MISS_LINES = {
+    "head": "You aimed for the head but missed %s entirely!",
+    "body": "You aimed for the body but missed %s entirely!",
+}
+_ENEMY_AIM_LINES = {
+    ("head", "head"): "%s aims for your head and hits!",
+    ("head", "body"): "%s aims for your head but hits your body instead!",
+    ("body", "body"): "%s aims for your body and hits!",
+}
+_ENEMY_MISS_LINE = "%s attacks you but misses!"
+_COUNTER_MISS_LINE = "%s tries to hit you but misses!"
+
+# Whole stats panel as one template, so display_stats is a single format and write
+_STATS_PANEL = (
+    "\n--- Your Stats ---\n"
+    "Health: %s\n"
+    "Stamina: %s\n"
+    "Roubles: %s₽\n"
+    "Equipped Weapon: %s\n"
+    "Equipped Body Armor: %s\n"
+    "Equipped Helmet: %s\n"
+    "Inventory Weight: %s/%s\n"
+    "Status: %s\n"
+    "------------------\n"
+)
+
+# Health status labels, colored once at import
+_HEALTHY = GREEN + "Healthy" + RESET
+_SLIGHTLY_WOUNDED = GREEN + "Slightly Wounded" + RESET
+_WOUNDED = YELLOW + "Wounded" + RESET
+_SEVERELY_WOUNDED = YELLOW + "Severely Wounded" + RESET
+_CRITICAL = RED + "Critical" + RESET
+_DECEASED = BRIGHT_BLACK + "Deceased" + RESET
 
 # --- Item Classes ---
 
+_WEIGHT = attrgetter('weight') # For C-level weight totals: sum(map(_WEIGHT, items))
+_NAME = attrgetter('name') # For save-file name lists: list(map(_NAME, items))
+
+# Item.KIND tags, checked instead of isinstance() when dispatching on item type
+KIND_ITEM, KIND_WEAPON, KIND_ARMOR, KIND_CONSUMABLE = range(4)
+
 class Item:
     """Base class for all items in the game."""
+    __slots__ = ('name', 'description', 'weight', 'value', '_info', '_name_lc')
+    KIND = KIND_ITEM
+
     def __init__(self, name, description, weight=1, value=100): # Added value
         self.name = name
         self.description = description
         self.weight = weight
         self.value = value # Monetary value in roubles
+        self._name_lc = name.lower() # For case-insensitive prefix matching
+        self._info = None # get_info() text, built on first use (items never change after construction)
 
     def __str__(self):
         return self.name
 
     def get_info(self):
+        info = self._info
+        if info is None:
+            info = self._info = self._build_info()
+        return info
+
+    def _build_info(self):
         return f"{self.name}: {self.description} (Weight: {self.weight}kg, Value: {self.value}₽)"
 
+    def equip_on(self, player):
+        """Equips this item on player in the right slot; overridden by the equippable kinds."""
+        print(f"{self.name} cannot be equipped.")
+
 class Weapon(Item):
     """Represents a weapon item."""
+    __slots__ = ('damage', 'weapon_type', 'effective_range_type', 'caliber')
+    KIND = KIND_WEAPON
+
     def __init__(self, name, description, damage, weapon_type="ranged", weight=2, effective_range_type="medium", caliber="N/A", value=1000):
         super().__init__(name, description, weight, value)
         self.damage = damage
@@ -47,36 +258,172 @@ class Weapon(Item):
         self.effective_range_type = effective_range_type
         self.caliber = caliber
 
-    def get_info(self):
+    def _build_info(self):
         if self.weapon_type == "melee":
             return f"{self.name}: {self.description} (Weight: {self.weight}kg, Value: {self.value}₽), Type: {self.weapon_type}, Optimal Range: {self.effective_range_type.replace('_', ' ').capitalize()}"
         else:
             return f"{self.name}: {self.description} (Weight: {self.weight}kg, Value: {self.value}₽), Type: {self.weapon_type}, Optimal Range: {self.effective_range_type.replace('_', ' ').capitalize()}, Caliber: {self.caliber}"
 
+    def equip_on(self, player):
+        player.equip_weapon(self)
+
 class Armor(Item):
     """Represents an armor item."""
+    __slots__ = ('defense', 'slot')
+    KIND = KIND_ARMOR
+
     def __init__(self, name, description, defense, slot="body", weight=3, value=1000):
         super().__init__(name, description, weight, value)
         self.defense = defense
         self.slot = slot
 
-    def get_info(self):
+    def _build_info(self):
         return f"{self.name}: {self.description} (Weight: {self.weight}kg, Value: {self.value}₽), Slot: {self.slot.capitalize()}"
 
+    def equip_on(self, player):
+        player.equip_armor(self) # Body armor and helmets alike; equip_armor picks the slot
+
 class Consumable(Item):
     """Represents a consumable item (e.g., medkit, food)."""
+    __slots__ = ('effect_type', 'effect_value')
+    KIND = KIND_CONSUMABLE
+
     def __init__(self, name, description, effect_type, effect_value, weight=0.5, value=100):
         super().__init__(name, description, weight, value)
         self.effect_type = effect_type
         self.effect_value = effect_value
 
-    def get_info(self):
-        return f"{super().get_info()}, Effect: {self.effect_type.replace('_', ' ').capitalize()} ({self.effect_value})"
+    def _build_info(self):
+        return f"{super()._build_info()}, Effect: {self.effect_type.replace('_', ' ').capitalize()} ({self.effect_value})"
+
+# --- Item Tables ---
+# One row per item prototype; Game builds each once and stores it as self.<attribute>.
+
+# (attribute, name, description, damage, weapon_type, weight, effective_range_type, caliber, value)
+_WEAPON_SPECS = (
+    ("pistol", "Makarov PM", "A common sidearm, reliable in close quarters.", 15, "ranged", 1.5, "short", "9x18mm Makarov", 5000),
+    ("ak74n", "AK-74N", "A standard-issue assault rifle, known for its versatility.", 30, "ranged", 4, "medium", "5.45x39mm", 35000),
+    ("shotgun", "MP-153", "A devastating shotgun, effective at very close range.", 40, "ranged", 3.5, "very_short", "12 gauge", 20000),
+    ("knife", "Combat Knife", "A simple, sharp blade for desperate situations.", 10, "melee", 0.5, "very_short", "N/A", 1500),
+    ("mosin", "Mosin", "A vintage bolt-action rifle, capable of long-range precision.", 50, "ranged", 6, "long", "7.62x54mmR", 40000),
+    ("mp5", "MP5", "A compact submachine gun with a high rate of fire.", 25, "ranged", 3, "short", "9x19mm Parabellum", 28000),
+    ("akm", "AKM", "A robust assault rifle, favored for its stopping power.", 35, "ranged", 4.5, "medium", "7.62x39mm", 40000),
+    ("m4a1", "M4A1", "A modern assault rifle, highly customizable and accurate.", 32, "ranged", 3.8, "medium", "5.56x45mm NATO", 55000),
+    ("svd", "SVD", "A powerful designated marksman rifle, ideal for long-distance engagements.", 60, "ranged", 7, "long", "7.62x54mmR", 80000),
+    ("toz_106", "TOZ-106", "A sawed-off shotgun, highly lethal up close but limited range.", 35, "ranged", 2, "very_short", "12 gauge", 8000),
+    ("vpo_209", "VPO-209", "A civilian hunting rifle, decent power and range.", 28, "ranged", 3.5, "medium", ".366 TKM", 15000),
+    ("tt_pistol", "TT Pistol", "An old but reliable semi-automatic pistol.", 18, "ranged", 1, "short", "7.62x25mm TT", 6000),
+    ("pm_silenced", "PM (Silenced)", "A Makarov pistol with a crude suppressor.", 16, "ranged", 1.8, "short", "9x18mm Makarov", 7000),
+)
+
+# (attribute, name, description, defense, slot, weight, value)
+_ARMOR_SPECS = (
+    ("paca_armor", "PACA Body Armor", "Basic soft armor vest.", 5, "body", 5, 12000),
+    ("kirasa_armor", "Kirasa Armor", "Medium-grade body armor.", 10, "body", 8, 25000),
+    ("gen4_armor", "Gen4 Armor", "Heavy-duty modular armor.", 15, "body", 12, 60000),
+    ("ssh68_helmet", "SSh-68 Helmet", "A basic steel helmet.", 3, "head", 2, 8000),
+    ("kolpak_helmet", "Kolpak-1 Helmet", "A simple protective helmet.", 5, "head", 3, 15000),
+    ("altyn_helmet", "Altyn Helmet", "Heavy-duty titanium helmet with faceshield.", 12, "head", 7, 85000),
+    ("tarbank_armor", "Tarbank Armor", "Light civilian body armor.", 4, "body", 4, 10000),
+    ("un_helmet", "UN Helmet", "A simple, light-duty helmet.", 2, "head", 1.5, 5000),
+    ("beanie", "Beanie", "A knitted hat. Offers no protection.", 0, "head", 0.1, 500),
+)
+
+# (attribute, name, description, effect_type, effect_value, weight, value)
+_CONSUMABLE_SPECS = (
+    ("medkit", "AI-2 Medkit", "A basic medical kit.", "heal", 50, 0.5, 3000),
+    ("painkillers", "Painkillers", "Reduces pain, restores some health.", "heal", 20, 0.2, 1500), # Changed from stamina_restore to heal
+    ("morphine", "Morphine", "Strong painkiller.", "heal", 40, 0.1, 4000),
+    ("water_bottle", "Water Bottle", "Quenches thirst.", "stamina_restore", 20, 0.3, 800),
+    ("bandage", "Bandage", "Stops light bleeding.", "cure_bleeding", 0, 0.1, 500),
+    ("esmarch", "Esmarch Tourniquet", "Stops heavy bleeding.", "cure_bleeding", 0, 0.1, 1200),
+    ("grizzly_medkit", "Grizzly Medkit", "A comprehensive medical kit.", "heal", 100, 1.5, 10000),
+    ("energy_drink", "Energy Drink", "Boosts stamina significantly.", "stamina_restore", 50, 0.3, 2000),
+    ("alyonka_chocolate", "Alyonka Chocolate", "A sweet treat, provides a small stamina boost.", "stamina_restore", 15, 0.1, 700),
+    ("can_of_sprats", "Can of Sprats", "A small can of fish, provides minor stamina.", "stamina_restore", 10, 0.2, 600), # Changed from heal to stamina_restore
+    ("chocolate_bar", "Chocolate Bar", "A sugary treat.", "stamina_restore", 10, 0.1, 500),
+    ("mre", "MRE", "Meal Ready-to-Eat. Restores stamina.", "stamina_restore", 30, 0.8, 2500), # Changed from heal to stamina_restore
+)
+
+# (attribute, name, description, weight, value)
+_ITEM_SPECS = (
+    ("spark_plug", "Spark Plug", "A small engine part.", 0.1, 1000),
+    ("wires", "Wires", "A coil of electrical wires.", 0.2, 800),
+    ("ammunition", "Ammunition", "5.45x39mm rounds.", 0.3, 1500), # Representing a small pack
+    ("valuable_item", "Valuable Item", "A rare and valuable trinket.", 0.5, 25000),
+    ("grenade", "Grenade", "A fragmentation grenade.", 0.4, 4000),
+    ("gold_chain", "Gold Chain", "A valuable gold chain.", 0.1, 15000),
+    ("wrench", "Wrench", "A rusty wrench.", 1, 900),
+    ("matches", "Matches", "A box of matches.", 0.1, 100),
+    ("lighter", "Lighter", "A simple disposable lighter.", 0.05, 200),
+    ("broken_lcd", "Broken LCD", "A shattered LCD screen.", 0.2, 1200),
+    ("keycard", "Keycard", "A valuable keycard.", 0.05, 50000),
+    ("screwdriver", "Screwdriver", "A common tool.", 0.3, 700),
+    ("bolts", "Bolts", "A handful of assorted bolts.", 0.2, 300), # Added bolts
+    ("nuts", "Nuts", "A handful of assorted nuts.", 0.2, 300), # Added nuts
+)
+
+# --- World Loot Tables ---
+
+# (location name, item attribute) for loot lying on the ground at game start
+_GROUND_LOOT = (
+    ("Dormitories - 2 Story", "ak74n"),
+    ("Dormitories - 3 Story", "medkit"),
+    ("Factory Gate - Guardhouse", "shotgun"),
+    ("Scav Camp - Main", "paca_armor"),
+    ("Old Gas Station - Main", "painkillers"),
+    ("Woods - North Clearing", "water_bottle"),
+    ("Trailer Park - North", "kirasa_armor"),
+    ("Construction Site - Foundations", "mosin"),
+    ("Power Station - Turbine Hall", "gen4_armor"),
+    ("Village - Center", "mp5"),
+    ("Swamp - Main", "esmarch"),
+    ("Resort - East Wing", "m4a1"),
+    ("Resort - West Wing", "altyn_helmet"),
+    ("Military Base - Bunker Complex", "svd"),
+    ("Military Base - Heli Crash", "grizzly_medkit"),
+    ("Lighthouse - Summit", "akm"),
+    ("Shoreline Road - South", "kolpak_helmet"),
+    ("Shoreline Road - Bus Station", "energy_drink"),
+)
+
+# (location name, container name, description, item attributes)
+_CONTAINER_SPECS = (
+    ("Dormitories - 2 Story", "Duffle Bag", "A worn-out duffle bag.", ("painkillers", "spark_plug")),
+    ("Factory Gate - Main", "Wooden Crate", "A sturdy wooden crate, probably used for shipping.", ("bandage", "wires")),
+    ("Power Station - Control Room", "Weapon Box", "A military-grade weapon box.", ("ak74n", "ammunition")),
+    ("Village - Houses", "Shed Stash", "A hidden stash in an old shed.", ("medkit", "valuable_item")),
+    ("Resort - Admin Building", "Medical Bag", "A large medical bag.", ("grizzly_medkit", "esmarch", "morphine")),
+    ("Military Base - Barracks", "Weapon Crate", "A sealed military weapon crate.", ("m4a1", "svd", "grenade")),
+    ("Lighthouse - Base", "Supply Cache", "A small, waterproof supply cache.", ("akm", "gold_chain")),
+    ("Customs Office - Storage", "Toolbox", "A dusty metal toolbox.", ("bolts", "nuts", "screwdriver")),
+    ("Woods - Logging Camp", "Wooden Box", "A simple wooden box.", ("alyonka_chocolate", "can_of_sprats")),
+)
+
+# --- Enemy Tables ---
+
+_ELITE_ENEMY_NAMES = ("USEC PMC", "Elite Scav") # Renamed "Heavy Guard" to "USEC PMC"
+
+# Spawned enemy kinds: (names, health range, damage range, base hit chance, common loot count range,
+# Game attributes holding the weapon/armor/helmet pools, article for the lurk notice)
+_ENEMY_ARCHETYPES = (
+    # Heavily armored enemy (like a "Boss Guard")
+    (_ELITE_ENEMY_NAMES, (150, 250), (25, 35), 0.60, (2, 4), ("elite_weapons", "elite_armor", "elite_helmets"), "A"),
+    # Armored Scav; hit chance increased slightly for more challenge
+    (("Armored Scav",), (70, 120), (18, 25), 0.55, (1, 3),
+     ("armored_scav_weapons", "armored_scav_armor", "armored_scav_helmets"), "An"),
+    # Regular Scav; decreased hit chance, lower-tier armor/helmets only
+    (("Scav",), (40, 70), (10, 18), 0.45, (0, 2), ("scav_weapons", "scav_armor_pieces", "scav_helmets"), "A"),
+)
+# A spawn roll below 0.15 picks the first kind (15%), below 0.40 the second (25%), anything else the last (60%)
+_ENEMY_ARCHETYPE_THRESHOLDS = (0.15, 0.40)
 
 # --- Character Classes ---
 
 class Character:
     """Base class for any character in the game (Player or Enemy)."""
+    __slots__ = ('name', 'max_health', 'current_health', 'damage', 'defense', 'is_alive')
+
     def __init__(self, name, max_health, current_health, damage, defense):
         self.name = name
         self.max_health = max_health
@@ -86,7 +433,7 @@ class Character:
         self.is_alive = True
 
     def take_damage(self, amount, hit_location="body"):
-        effective_damage = max(0, amount - self.defense)
+        effective_damage = _resolve_damage(amount, self.defense)
         
         self.current_health -= effective_damage
         if self.current_health <= 0:
@@ -102,6 +449,11 @@ class Character:
 
 class Player(Character):
     """Represents the player character."""
+    __slots__ = ('inventory', 'max_inventory_weight', 'equipped_weapon', 'equipped_armor', 'equipped_helmet',
+                 'max_stamina', 'current_stamina', 'is_bleeding', 'roubles', '_shot_resolver',
+                 '_current_weight', '_inventory_counts', '_event_log', '_equipped_ids',
+                 '_status_health', '_status_label')
+
     def __init__(self, name="PMC"):
         super().__init__(name, max_health=100, current_health=100, damage=5, defense=0)
         self.inventory = []
@@ -109,134 +461,253 @@ class Player(Character):
         self.equipped_weapon = None
         self.equipped_armor = None
         self.equipped_helmet = None
+        self._equipped_ids = frozenset() # id() of each equipped item, for is_equipped()
+        self._shot_resolver = None # Hit-chance resolver for the equipped weapon's range
         self.max_stamina = 100
         self.current_stamina = 100
         self.is_bleeding = False
         self.roubles = 0 # New: Player's currency
+        self._current_weight = 0 # Running total of inventory plus equipped gear
+        self._inventory_counts = {} # id(item) -> copies carried; items are shared prototypes, so one may appear twice
+        self._event_log = None # When a list, player messages are collected there instead of printed
+        self._status_health = None # current_health that _status_label was last worked out for
+        self._status_label = None
+
+    def _say(self, message):
+        log = self._event_log
+        if log is None:
+            print(message)
+        else:
+            log.append(message)
+
+    def buffer_messages(self, out):
+        """Collects the player's messages into the list out (None to print them directly again)."""
+        self._event_log = out
+
+    def reset_for_raid(self):
+        """Full health and stamina, no bleeding: the state every raid starts in."""
+        self.current_health = self.max_health
+        self.current_stamina = self.max_stamina
+        self.is_bleeding = False
 
     def get_current_weight(self):
-        total_weight = sum(item.weight for item in self.inventory)
+        return self._current_weight
+
+    def _adjust_weight(self, delta):
+        # Weights are multiples of 0.05kg; rounding keeps float error from piling up in the running total
+        self._current_weight = round(self._current_weight + delta, 2)
+
+    def _recount_weight(self):
+        total_weight = sum(map(_WEIGHT, self.inventory))
         if self.equipped_weapon:
             total_weight += self.equipped_weapon.weight
         if self.equipped_armor:
             total_weight += self.equipped_armor.weight
         if self.equipped_helmet:
             total_weight += self.equipped_helmet.weight
-        return total_weight
+        self._current_weight = round(total_weight, 2)
+
+    def has_item(self, item):
+        return id(item) in self._inventory_counts
+
+    def _inventory_append(self, item):
+        self.inventory.append(item)
+        counts = self._inventory_counts
+        key = id(item)
+        counts[key] = counts.get(key, 0) + 1
+
+    def _inventory_remove(self, item):
+        """Removes one copy of item from the inventory. Returns False if it isn't carried."""
+        counts = self._inventory_counts
+        key = id(item)
+        carried = counts.get(key)
+        if not carried:
+            return False
+        if carried == 1:
+            del counts[key]
+        else:
+            counts[key] = carried - 1
+        self.inventory.remove(item)
+        return True
 
     def add_item(self, item):
         if self.get_current_weight() + item.weight <= self.max_inventory_weight:
-            self.inventory.append(item)
-            print(f"You picked up {item.name}.")
+            self._inventory_append(item)
+            self._adjust_weight(item.weight)
+            self._say(f"You picked up {item.name}.")
             return True
         else:
-            print(f"Your inventory is too full to pick up {item.name}.")
+            self._say(f"Your inventory is too full to pick up {item.name}.")
             return False
 
     def remove_item(self, item):
-        if item in self.inventory:
-            self.inventory.remove(item)
-            print(f"You dropped {item.name}.")
+        if self._inventory_remove(item):
+            self._adjust_weight(-item.weight)
+            self._say(f"You dropped {item.name}.")
             return True
         return False
 
+    def stash_item(self, item):
+        """Puts an item into the inventory without a weight check or message (callers check space)."""
+        self._inventory_append(item)
+        self._adjust_weight(item.weight)
+
+    def unstash_item(self, item):
+        """Takes an item out of the inventory without a message."""
+        if self._inventory_remove(item):
+            self._adjust_weight(-item.weight)
+
+    def set_inventory(self, items):
+        """Replaces the whole inventory, e.g. when loading a save."""
+        self.inventory = items
+        counts = self._inventory_counts = {}
+        for item in items:
+            key = id(item)
+            counts[key] = counts.get(key, 0) + 1
+        self._recount_weight()
+
+    def clear_slot(self, slot):
+        """Empties an equipment slot ("weapon", "armor" or "helmet") and returns what was in it."""
+        if slot == "weapon":
+            item = self.equipped_weapon
+            self.equipped_weapon = None
+            self._shot_resolver = None
+            self.damage = 5 # Reset base damage if no weapon is equipped
+        elif slot == "armor":
+            item = self.equipped_armor
+            self.equipped_armor = None
+        else:
+            item = self.equipped_helmet
+            self.equipped_helmet = None
+        if item:
+            self._adjust_weight(-item.weight)
+            self._sync_equipped_ids()
+        return item
+
+    def _sync_equipped_ids(self):
+        self._equipped_ids = frozenset([id(item) for item in (self.equipped_weapon, self.equipped_armor, self.equipped_helmet) if item])
+
+    def is_equipped(self, item):
+        return id(item) in self._equipped_ids
+
+    def accessible_items(self):
+        """The inventory list plus each equipment slot, in the form _fuzzy_find_item_in_lists takes (empty slots are skipped there)."""
+        return (self.inventory, self.equipped_weapon, self.equipped_armor, self.equipped_helmet)
+
+    def _can_swap(self, new_item):
+        # The slot's current item is already part of the carried weight, so only the new item is added
+        return self._current_weight + new_item.weight <= self.max_inventory_weight
+
     def equip_weapon(self, weapon):
-        if not isinstance(weapon, Weapon):
-            print(f"{weapon.name} cannot be equipped as a weapon.")
+        if weapon.KIND != KIND_WEAPON:
+            self._say(f"{weapon.name} cannot be equipped as a weapon.")
             return
 
         # If already equipped, move old weapon to inventory if space, otherwise don't equip new one
         if self.equipped_weapon:
-            if self.get_current_weight() + self.equipped_weapon.weight + weapon.weight - (self.equipped_weapon.weight if self.equipped_weapon else 0) <= self.max_inventory_weight:
-                self.inventory.append(self.equipped_weapon)
-                print(f"You unequipped {self.equipped_weapon.name}.")
+            if self._can_swap(weapon):
+                self._inventory_append(self.equipped_weapon)
+                self._say(f"You unequipped {self.equipped_weapon.name}.")
             else:
-                print(f"Your inventory is too full to unequip {self.equipped_weapon.name} and equip {weapon.name}.")
+                self._say(f"Your inventory is too full to unequip {self.equipped_weapon.name} and equip {weapon.name}.")
                 return
 
         self.equipped_weapon = weapon
-        if weapon in self.inventory:
-            self.inventory.remove(weapon)
+        self._sync_equipped_ids()
+        if not self._inventory_remove(weapon): # Moving from inventory to a slot leaves the total unchanged
+            self._adjust_weight(weapon.weight)
         self.damage = self.equipped_weapon.damage
-        print(f"You equipped {weapon.name}.")
+        self._shot_resolver = _make_resolver(weapon.effective_range_type)
+        self._say(f"You equipped {weapon.name}.")
 
     def equip_armor(self, armor):
-        if not isinstance(armor, Armor):
-            print(f"{armor.name} cannot be equipped as armor.")
+        if armor.KIND != KIND_ARMOR:
+            self._say(f"{armor.name} cannot be equipped as armor.")
             return
 
         if armor.slot == "body":
             if self.equipped_armor:
-                if self.get_current_weight() + self.equipped_armor.weight + armor.weight - (self.equipped_armor.weight if self.equipped_armor else 0) <= self.max_inventory_weight:
-                    self.inventory.append(self.equipped_armor)
-                    print(f"You unequipped {self.equipped_armor.name}.")
+                if self._can_swap(armor):
+                    self._inventory_append(self.equipped_armor)
+                    self._say(f"You unequipped {self.equipped_armor.name}.")
                 else:
-                    print(f"Your inventory is too full to unequip {self.equipped_armor.name} and equip {armor.name}.")
+                    self._say(f"Your inventory is too full to unequip {self.equipped_armor.name} and equip {armor.name}.")
                     return
             self.equipped_armor = armor
-            if armor in self.inventory:
-                self.inventory.remove(armor)
-            print(f"You equipped {armor.name} (Body).")
+            self._sync_equipped_ids()
+            if not self._inventory_remove(armor):
+                self._adjust_weight(armor.weight)
+            self._say(f"You equipped {armor.name} (Body).")
         elif armor.slot == "head":
             if self.equipped_helmet:
-                if self.get_current_weight() + self.equipped_helmet.weight + armor.weight - (self.equipped_helmet.weight if self.equipped_helmet else 0) <= self.max_inventory_weight:
-                    self.inventory.append(self.equipped_helmet)
-                    print(f"You unequipped {self.equipped_helmet.name}.")
+                if self._can_swap(armor):
+                    self._inventory_append(self.equipped_helmet)
+                    self._say(f"You unequipped {self.equipped_helmet.name}.")
                 else:
-                    print(f"Your inventory is too full to unequip {self.equipped_helmet.name} and equip {armor.name}.")
+                    self._say(f"Your inventory is too full to unequip {self.equipped_helmet.name} and equip {armor.name}.")
                     return
             self.equipped_helmet = armor
-            if armor in self.inventory:
-                self.inventory.remove(armor)
-            print(f"You equipped {armor.name} (Head).")
+            self._sync_equipped_ids()
+            if not self._inventory_remove(armor):
+                self._adjust_weight(armor.weight)
+            self._say(f"You equipped {armor.name} (Head).")
         else:
-            print(f"Cannot equip {armor.name} to an unknown slot: {armor.slot}.")
+            self._say(f"Cannot equip {armor.name} to an unknown slot: {armor.slot}.")
 
     def use_consumable(self, consumable):
-        if not isinstance(consumable, Consumable):
-            print(f"{consumable.name} is not a consumable item.")
+        if consumable.KIND != KIND_CONSUMABLE:
+            self._say(f"{consumable.name} is not a consumable item.")
             return False
-        if consumable not in self.inventory:
-            print(f"You don't have {consumable.name} in your inventory.")
+        if not self.has_item(consumable):
+            self._say(f"You don't have {consumable.name} in your inventory.")
             return False
 
         if consumable.effect_type == "heal":
             self.heal(consumable.effect_value)
-            print(f"You used {consumable.name} and healed {consumable.effect_value} HP. Current HP: {self.current_health}/{self.max_health}")
+            self._say(f"You used {consumable.name} and healed {consumable.effect_value} HP. Current HP: {self.current_health}/{self.max_health}")
         elif consumable.effect_type == "stamina_restore":
             self.current_stamina = min(self.max_stamina, self.current_stamina + consumable.effect_value)
-            print(f"You used {consumable.name} and restored {consumable.effect_value} stamina. Current Stamina: {self.current_stamina}/{self.max_stamina}")
+            self._say(f"You used {consumable.name} and restored {consumable.effect_value} stamina. Current Stamina: {self.current_stamina}/{self.max_stamina}")
         elif consumable.effect_type == "cure_bleeding":
             if self.is_bleeding:
                 self.is_bleeding = False
-                print(f"You used {consumable.name} and stopped the bleeding.")
+                self._say(f"You used {consumable.name} and stopped the bleeding.")
             else:
-                print(f"You are not bleeding. {consumable.name} has no effect.")
+                self._say(f"You are not bleeding. {consumable.name} has no effect.")
                 return False
         
-        self.inventory.remove(consumable)
+        self._inventory_remove(consumable)
+        self._adjust_weight(-consumable.weight)
         return True
 
     def restore_stamina(self, amount):
         self.current_stamina = min(self.max_stamina, self.current_stamina + amount)
 
     def _get_health_status(self):
-        health_percentage = (self.current_health / self.max_health) * 100
-        if health_percentage >= 80: # Healthy
-            return f"{Colors.GREEN}Healthy{Colors.RESET}"
-        elif health_percentage >= 60: # Slightly Wounded
-            return f"{Colors.GREEN}Slightly Wounded{Colors.RESET}"
-        elif health_percentage >= 40: # Wounded
-            return f"{Colors.YELLOW}Wounded{Colors.RESET}"
-        elif health_percentage >= 20: # Severely Wounded
-            return f"{Colors.YELLOW}Severely Wounded{Colors.RESET}"
-        elif health_percentage >= 1: # Critical
-            return f"{Colors.RED}Critical{Colors.RESET}"
-        else: # Deceased
-            return f"{Colors.BRIGHT_BLACK}Deceased{Colors.RESET}"
+        # Shown several times per combat round, usually with health unchanged in between
+        health = self.current_health
+        if health != self._status_health:
+            self._status_health = health
+            self._status_label = self._health_label()
+        return self._status_label
+
+    def _health_label(self):
+        health_percentage = self.current_health * 100 // self.max_health
+        if health_percentage >= 80:
+            return _HEALTHY
+        elif health_percentage >= 60:
+            return _SLIGHTLY_WOUNDED
+        elif health_percentage >= 40:
+            return _WOUNDED
+        elif health_percentage >= 20:
+            return _SEVERELY_WOUNDED
+        elif health_percentage >= 1:
+            return _CRITICAL
+        else:
+            return _DECEASED
 
     def _get_stamina_status(self):
-        stamina_percentage = (self.current_stamina / self.max_stamina) * 100
+        stamina_percentage = self.current_stamina * 100 // self.max_stamina
         if stamina_percentage >= 80:
             return "Normal"
         elif stamina_percentage >= 40:
@@ -247,25 +718,25 @@ class Player(Character):
             return "Exhausted"
 
     def display_stats(self):
-        print("\n--- Your Stats ---")
-        print(f"Health: {self._get_health_status()}")
-        print(f"Stamina: {self._get_stamina_status()}")
-        print(f"Roubles: {self.roubles}₽") # Display roubles
-        print(f"Equipped Weapon: {self.equipped_weapon.name if self.equipped_weapon else 'None'}")
-        print(f"Equipped Body Armor: {self.equipped_armor.name if self.equipped_armor else 'None'}")
-        print(f"Equipped Helmet: {self.equipped_helmet.name if self.equipped_helmet else 'None'}")
-        print(f"Inventory Weight: {self.get_current_weight()}/{self.max_inventory_weight}")
-        print(f"Status: {'Bleeding' if self.is_bleeding else 'Normal'}")
-        print("------------------")
+        sys.stdout.write(_STATS_PANEL % (
+            self._get_health_status(),
+            self._get_stamina_status(),
+            self.roubles,
+            self.equipped_weapon.name if self.equipped_weapon else 'None',
+            self.equipped_armor.name if self.equipped_armor else 'None',
+            self.equipped_helmet.name if self.equipped_helmet else 'None',
+            self._current_weight, self.max_inventory_weight,
+            'Bleeding' if self.is_bleeding else 'Normal',
+        ))
 
     def display_inventory(self):
-        print("\n--- Your Inventory ---")
+        out = ["\n--- Your Inventory ---"]
         if not self.inventory:
-            print("Inventory is empty.")
+            out.append("Inventory is empty.")
         else:
-            for i, item in enumerate(self.inventory):
-                print(f"{i+1}. {item.get_info()}")
-        print("----------------------")
+            out.extend([f"{i}. {item.get_info()}" for i, item in enumerate(self.inventory, 1)])
+        out.append("----------------------")
+        _emit(out)
 
     def take_damage(self, amount, hit_location="body"):
         defense_value = 0
@@ -274,24 +745,25 @@ class Player(Character):
         elif hit_location == "body" and self.equipped_armor:
             defense_value = self.equipped_armor.defense
         
-        effective_damage = max(0, amount - defense_value)
-        
-        if hit_location == "head" and not self.equipped_helmet:
-            effective_damage = int(effective_damage * 1.5)
+        bare_head = hit_location == "head" and not self.equipped_helmet
+        effective_damage = _resolve_damage(amount, defense_value, _PLAYER_BARE_HEAD_MULT if bare_head else 0)
 
         self.current_health -= effective_damage
         if self.current_health <= 0:
             self.current_health = 0
             self.is_alive = False
         
-        if effective_damage > 0 and (random.random() < 0.25 or (hit_location == "head" and not self.equipped_helmet)):
+        if effective_damage > 0 and (_random() < 0.25 or bare_head):
             if not self.is_bleeding:
                 self.is_bleeding = True
-                print("You are bleeding!")
+                self._say("You are bleeding!")
         return effective_damage
 
 class Enemy(Character):
     """Represents an enemy character."""
+    __slots__ = ('loot_items', 'equipped_weapon', 'equipped_armor', 'equipped_helmet', 'base_hit_chance', 'hit_chance',
+                 'colored_name', '_condition_health', '_condition')
+
     def __init__(self, name, max_health, damage, defense, loot_items=None, equipped_weapon=None, equipped_armor=None, equipped_helmet=None, base_hit_chance=0.65):
         super().__init__(name, max_health, max_health, damage, defense)
         self.loot_items = loot_items if loot_items is not None else []
@@ -299,8 +771,24 @@ class Enemy(Character):
         self.equipped_armor = equipped_armor
         self.equipped_helmet = equipped_helmet
         self.base_hit_chance = base_hit_chance
+        self.hit_chance = base_hit_chance # Range-adjusted chance, set when placed in a location
+        self.colored_name = RED + name + RESET # Names never change; combat messages use this form every turn
+        self._condition_health = None # current_health that _condition was last worked out for
+        self._condition = None
+
+    def release_loot(self):
+        """Drops this enemy's references to its gear and loot once they have been moved to the ground."""
+        self.loot_items = ()
+        self.equipped_weapon = self.equipped_armor = self.equipped_helmet = None
 
     def get_condition(self):
+        health = self.current_health
+        if health != self._condition_health:
+            self._condition_health = health
+            self._condition = self._condition_label()
+        return self._condition
+
+    def _condition_label(self):
         health_percentage = (self.current_health / self.max_health) * 100
         if health_percentage >= 75:
             return "Healthy"
@@ -318,11 +806,11 @@ class Enemy(Character):
         elif hit_location == "body" and self.equipped_armor:
             defense_value += self.equipped_armor.defense
         
-        effective_damage = max(0, amount - defense_value)
-        
         if hit_location == "head" and not self.equipped_helmet:
-            effective_damage = int(effective_damage * 2)
+            effective_damage = _resolve_damage(amount, defense_value, _ENEMY_BARE_HEAD_MULT)
             print(f"Critical hit on {self.name}'s head (no helmet)!")
+        else:
+            effective_damage = _resolve_damage(amount, defense_value)
 
         self.current_health -= effective_damage
         if self.current_health <= 0:
@@ -333,8 +821,11 @@ class Enemy(Character):
 # --- Container Class ---
 class Container:
     """Represents a lootable container in a location."""
+    __slots__ = ('name', 'description', 'items', 'is_looted', '_name_lc')
+
     def __init__(self, name, description, items=None):
         self.name = name
+        self._name_lc = name.lower() # For case-insensitive prefix matching
         self.description = description
         self.items = items if items is not None else []
         self.is_looted = False
@@ -348,77 +839,285 @@ class Container:
 
 # --- Location Class ---
 
+# Locations whose name contains one of these are more populated and get a higher enemy spawn chance
+_BUSY_AREA_TAGS = ("Dormitories", "Factory", "Resort", "Military Base")
+
 class Location:
     """Represents a location on the game map."""
+    __slots__ = ('name', 'description', 'exits', 'items', 'enemies', 'containers', 'is_extraction_point',
+                 'id', 'range_type', 'spawn_bonus', '_enemies_by_name', '_exit_directions', '_exits_text',
+                 '_exit_prefix_map')
+
     def __init__(self, name, description, is_extraction_point=False, range_type="medium"): # New range_type
         self.name = name
         self.description = description
-        self.exits = {} # {direction: Location_object}
-        self.items = [] # Items found directly in the location
-        self.enemies = [] # Enemies currently in the location
-        self.containers = [] # New: Containers in the location
+        self.exits = [None] * len(DIRECTIONS) # Destination Location per direction slot, None where there is no exit
+        self._exit_directions = [] # Directions that have an exit, in the order they were added
+        # items/enemies/containers stay None until something is added; most locations never get all three
+        self.items = None # Items found directly in the location
+        self.enemies = None # Enemies currently in the location
+        self._enemies_by_name = {} # {name.lower(): [Enemy, ...]} index over self.enemies
+        self.containers = None # New: Containers in the location
         self.is_extraction_point = is_extraction_point
-        self.visited = False # To track if player has been here before
+        self.id = 0 # Index in the map, set when the Game registers the location; selects its bit in Game._visited_mask
         self.range_type = range_type # "close", "medium", "long"
+        self.spawn_bonus = 0.2 if any(tag in name for tag in _BUSY_AREA_TAGS) else 0.0 # Added to the spawn chance
+        self._exits_text = None # Rendered exit listing, rebuilt lazily after exits change
+        self._exit_prefix_map = None # Direction autocompletion map, rebuilt lazily after exits change
 
     def add_exit(self, direction, destination_location):
         """Adds an exit to another location."""
-        self.exits[direction] = destination_location
+        slot = _DIRECTION_INDEX[direction]
+        if self.exits[slot] is None:
+            self._exit_directions.append(direction)
+        self.exits[slot] = destination_location
+        self._exits_text = None
+        self._exit_prefix_map = None
+
+    def get_exit(self, direction):
+        """Returns the location reached by going direction, or None if there is no such exit."""
+        slot = _DIRECTION_INDEX.get(direction)
+        return None if slot is None else self.exits[slot]
+
+    def get_exit_directions(self):
+        """Returns the directions that have an exit, in the order they were added."""
+        return self._exit_directions
+
+    def get_exits_text(self):
+        """Returns the exit listing as one string, one '- Direction to Name' line per exit."""
+        if self._exits_text is None:
+            exits = self.exits
+            self._exits_text = "\n".join(f"- {direction.capitalize()} to {exits[_DIRECTION_INDEX[direction]].name}" for direction in self._exit_directions)
+        return self._exits_text
+
+    def get_exit_prefix_map(self):
+        """Returns the prefix -> matching directions map used to autocomplete exit input."""
+        if self._exit_prefix_map is None:
+            self._exit_prefix_map = _build_prefix_map(self._exit_directions)
+        return self._exit_prefix_map
 
     def add_item(self, item):
         """Adds an item to the location."""
-        self.items.append(item)
+        if self.items is None:
+            self.items = [item]
+        else:
+            self.items.append(item)
+
+    def add_items(self, items):
+        """Adds several items to the location."""
+        if self.items is None:
+            self.items = list(items)
+        else:
+            self.items.extend(items)
 
     def remove_item(self, item):
         """Removes an item from the location."""
-        if item in self.items:
+        if self.items and item in self.items:
             self.items.remove(item)
             return True
         return False
 
     def add_enemy(self, enemy):
         """Adds an enemy to the location."""
-        self.enemies.append(enemy)
+        enemy.hit_chance = _enemy_hit_chance(enemy.base_hit_chance, self.range_type)
+        if self.enemies is None:
+            self.enemies = [enemy]
+        else:
+            self.enemies.append(enemy)
+        self._enemies_by_name.setdefault(enemy.name.lower(), []).append(enemy)
 
     def remove_enemy(self, enemy):
         """Removes an enemy from the location."""
-        if enemy in self.enemies:
+        if self.enemies and enemy in self.enemies:
             self.enemies.remove(enemy)
+            same_name = self._enemies_by_name[enemy.name.lower()]
+            same_name.remove(enemy)
+            if not same_name:
+                del self._enemies_by_name[enemy.name.lower()]
             return True
         return False
 
+    def clear_enemies(self):
+        """Removes all enemies from the location."""
+        self.enemies = None
+        self._enemies_by_name.clear()
+
+    def find_enemy(self, enemy_name):
+        """Returns the first living enemy whose name matches (case-insensitive), or None."""
+        for enemy in self._enemies_by_name.get(enemy_name.lower(), ()):
+            if enemy.is_alive:
+                return enemy
+        return None
+
     def add_container(self, container):
         """Adds a container to the location."""
-        self.containers.append(container)
+        if self.containers is None:
+            self.containers = [container]
+        else:
+            self.containers.append(container)
 
     def __str__(self):
         return self.name
 
+# --- Commands ---
+
+# Aliases shared by every Game; each maps straight to its (action, argument) pair so it needs no split.
+_COMMAND_ALIASES = {
+    "n": ("move", "north"), "e": ("move", "east"), "s": ("move", "south"), "w": ("move", "west"),
+    "ne": ("move", "northeast"), "nw": ("move", "northwest"), "se": ("move", "southeast"), "sw": ("move", "southwest"),
+    "inv": ("inventory", ""), "stat": ("stats", ""), "ex": ("examine", ""),
+    "h": ("help", ""), "q": ("quit", ""), "l": ("look", ""),
+    "sr": ("start_raid", ""), "sh": ("shop", ""), "st": ("storage", "") # Hideout commands
+}
+
+_RAID_COMMANDS = ("move", "look", "get", "drop", "equip", "use", "attack", "inventory", "stats", "search", "extract", "help", "quit", "examine", "rest", "flee")
+_HIDEOUT_COMMANDS = ("shop", "storage", "start_raid", "stats", "inventory", "help", "quit", "examine", "put", "take", "reset", "equip", "remove")
+
+# Typed command word -> commands it could complete to; built once so completion is a single dict lookup
+_RAID_COMMAND_PREFIXES = _build_prefix_map(_RAID_COMMANDS)
+_HIDEOUT_COMMAND_PREFIXES = _build_prefix_map(_HIDEOUT_COMMANDS)
+_COMBAT_CHOICE_PREFIXES = _build_prefix_map(("head", "body", "flee"))
+
+def _parse_command(command, prefix_map):
+    """
+    Resolves a lowercased command line to (action, arg, notice). notice is the autocomplete or
+    ambiguity line to show the player, or None; action is None when the command word is ambiguous.
+    """
+    alias = _COMMAND_ALIASES.get(command)
+    if alias is not None:
+        return alias + (None,)
+    notice = None
+    command_parts = command.split(maxsplit=1)
+    matching_commands = prefix_map.get(command_parts[0], ())
+
+    if len(matching_commands) == 1:
+        command = matching_commands[0] + (" " + (command_parts[1] if len(command_parts) > 1 else ""))
+        notice = f"(Autocompleted to: {command})"
+    elif len(matching_commands) > 1:
+        return None, "", f"Ambiguous command. Did you mean: {', '.join(matching_commands)}?"
+
+    command_parts = command.split(maxsplit=1)
+    return command_parts[0], (command_parts[1] if len(command_parts) > 1 else ""), notice
+
+# Players repeat the same few commands, so parsed results are memoized per mode
+@lru_cache(maxsize=256)
+def _parse_raid_command(command):
+    return _parse_command(command, _RAID_COMMAND_PREFIXES)
+
+@lru_cache(maxsize=256)
+def _parse_hideout_command(command):
+    return _parse_command(command, _HIDEOUT_COMMAND_PREFIXES)
+
+# --- Help Text ---
+
+_RAID_HELP_TEXT = """
+--- Raid Commands ---
+move [direction] (or n/e/s/w/ne/nw/se/sw) - Move to an adjacent location.
+look (or l) - Re-examine your current location.
+get [item name] - Pick up an item from the ground.
+drop [item name] - Drop an item from your inventory.
+equip [item name] - Equip a weapon, body armor, or helmet from your inventory.
+use [item name] - Use a consumable item from your inventory.
+attack [enemy name] - Attack an enemy in the current location.
+inventory (or inv) - View your inventory.
+stats (or stat) - View your player stats.
+search [container name] - Search a container in the current location.
+examine [item name] (or ex) - View detailed information about an item in your inventory.
+rest - Take a moment to recover stamina.
+flee [direction] - Attempt to escape combat in a specific direction.
+extract - Attempt to extract from the raid.
+help (or h) - Display this list of commands.
+quit (or q) - Exit the game.
+--------------------------"""
+
+_HIDEOUT_HELP_TEXT = """
+--- Hideout Commands ---
+shop (or sh) - Access the trader to buy and sell items.
+storage (or st) - Manage your personal hideout storage.
+start_raid (or sr) - Begin a new raid into Tarkov.
+inventory (or inv) - View your currently held inventory.
+stats (or stat) - View your player stats.
+equip [item name] - Equip a weapon, body armor, or helmet from your inventory.
+remove [item name] - Remove an equipped weapon, body armor, or helmet and place it in your inventory.
+examine [item name] (or ex) - View detailed information about an item in your inventory or storage.
+put - Move an item from your inventory to hideout storage (you will be prompted for item name).
+take - Move an item from hideout storage to your inventory (you will be prompted for item name).
+reset - Delete all save data and start a new game.
+help (or h) - Display this list of commands.
+quit (or q) - Save game and exit.
+--------------------------"""
+
 # --- Game Class ---
 
 class Game:
     """Manages the main game logic and flow."""
-    def __init__(self):
+    def __init__(self, pacing=True):
         self.player = Player()
         self.map = {}
+        self._visited_mask = 0 # Bit loc.id is set once the player has been to that location this raid
         self.current_location = None
         self.raid_timer = 100
         self.in_hideout = True # Game starts in hideout
-        self.hideout_storage = []
+        self._set_storage([])
         self.max_hideout_storage_weight = 200
         self.item_database = {} # To store all unique item instances for lookup
         self.raid_count = 0 # Initialize raid counter
-
-        self.command_aliases = {
-            "n": "move north", "e": "move east", "s": "move south", "w": "move west",
-            "ne": "move northeast", "nw": "move northwest", "se": "move southeast", "sw": "move southwest",
-            "inv": "inventory", "stat": "stats", "ex": "examine",
-            "h": "help", "q": "quit", "l": "look",
-            "sr": "start_raid", "sh": "shop", "st": "storage" # Hideout commands
+        self.pacing_enabled = pacing # Pause briefly after each command; disable for scripted/headless runs
+        self.combat_pace = 1.0 if pacing else 0.0 # Seconds between combat rounds
+
+        self.command_aliases = _COMMAND_ALIASES
+        # Raid actions that count as a turn: action -> (handler, whether it takes the argument)
+        self._raid_handlers = {
+            "move": (self.move_player, True),
+            "look": (self.display_location, False),
+            "get": (self.get_item, True),
+            "drop": (self.drop_item, True),
+            "equip": (self.equip_item, True),
+            "use": (self.use_item, True),
+            "attack": (self.attack_enemy, True),
+            "inventory": (self._display_inventory, False),
+            "inv": (self._display_inventory, False),
+            "stats": (self._display_stats, False),
+            "search": (self.search_container, True),
+            "examine": (self.examine_item, True),
+            "rest": (self.rest_player, False),
+            "extract": (self.check_extraction, False),
+        }
+        # Hideout actions, same layout; put/take prompt for the item name themselves
+        self._hideout_handlers = {
+            "shop": (self._handle_shop_interface, False),
+            "storage": (self._handle_storage_interface, False),
+            "start_raid": (self._start_raid, False),
+            "inventory": (self._display_inventory, False),
+            "inv": (self._display_inventory, False),
+            "stats": (self._display_stats, False),
+            "examine": (self.examine_item_in_hideout, True),
+            "put": (self._put_item_in_storage, False),
+            "take": (self._take_item_from_storage, False),
+            "equip": (self._equip_item_in_hideout, True),
+            "remove": (self._remove_equipped_item_in_hideout, True),
+            "reset": (self._reset_game_data, False),
+            "help": (self.display_hideout_help, False),
+        }
+        # Shop and storage sub-menus: first word of the answer -> (handler, whether it takes the rest)
+        self._shop_handlers = {
+            "list": (self._list_shop_stock, False),
+            "buy": (self._buy_item, True),
+            "sell": (self._sell_item, True),
+        }
+        self._storage_handlers = {
+            "list": (self._list_storage, False),
+            "put": (self._put_item_in_storage, False),
+            "take": (self._take_item_from_storage, False),
+            "examine": (self._examine_in_storage, True),
         }
         
         self._create_map()
+        self._locations = tuple(self.map.values()) # The map is fixed once built; raid setup walks this
+        # Extraction points never get spawns, so the spawn pass skips them up front
+        self._spawn_locations = tuple(loc for loc in self._locations if not loc.is_extraction_point)
         self._initialize_game_state() # This will now also load hideout data
+        self._take_damage = self.player.take_damage # Pre-bound for the per-turn bleeding tick
         
         # Set starting location AFTER map is fully created
         self.current_location = self.map["Customs Office - Main"] 
@@ -426,111 +1125,99 @@ class Game:
         self.game_over = False
         self.game_won = False
 
+    def _add_location(self, name, description, **kwargs):
+        """Creates a location and registers it in the map under its name."""
+        loc = Location(name, description, **kwargs)
+        loc.id = len(self.map)
+        self.map[name] = loc
+        return loc
+
     def _create_map(self):
         """Initializes all locations and their connections for a larger map."""
+        self.map = {}
+        add = self._add_location
         # Define major zones and their sub-locations
         # Customs Area
-        customs_main = Location("Customs Office - Main", "The central checkpoint, heavily damaged.", range_type="medium")
-        customs_east_wing = Location("Customs Office - East Wing", "A collapsed section of the office, dangerous debris.", range_type="close")
-        customs_west_wing = Location("Customs Office - West Wing", "Overgrown offices with broken windows.", range_type="medium")
-        customs_storage = Location("Customs Office - Storage", "Dark, dusty storage rooms, potential hidden stashes.", range_type="close")
+        customs_main = add("Customs Office - Main", "The central checkpoint, heavily damaged.", range_type="medium")
+        customs_east_wing = add("Customs Office - East Wing", "A collapsed section of the office, dangerous debris.", range_type="close")
+        customs_west_wing = add("Customs Office - West Wing", "Overgrown offices with broken windows.", range_type="medium")
+        customs_storage = add("Customs Office - Storage", "Dark, dusty storage rooms, potential hidden stashes.", range_type="close")
 
         # Dormitories Area
-        dorms_2_story = Location("Dormitories - 2 Story", "The smaller, two-story dormitory building.", range_type="close")
-        dorms_3_story = Location("Dormitories - 3 Story", "The larger, three-story dormitory building, known for intense fights.", range_type="close")
-        dorms_courtyard = Location("Dormitories - Courtyard", "The open area between the dorms, offers some cover.", range_type="medium")
-        dorms_boiler_room = Location("Dormitories - Boiler Room", "A cramped, dark boiler room beneath the dorms.", range_type="very_short")
+        dorms_2_story = add("Dormitories - 2 Story", "The smaller, two-story dormitory building.", range_type="close")
+        dorms_3_story = add("Dormitories - 3 Story", "The larger, three-story dormitory building, known for intense fights.", range_type="close")
+        dorms_courtyard = add("Dormitories - Courtyard", "The open area between the dorms, offers some cover.", range_type="medium")
+        dorms_boiler_room = add("Dormitories - Boiler Room", "A cramped, dark boiler room beneath the dorms.", range_type="very_short")
 
         # Factory Area
-        factory_gate_main = Location("Factory Gate - Main", "The primary entrance, heavily fortified.", range_type="medium")
-        factory_gate_guardhouse = Location("Factory Gate - Guardhouse", "A small, dilapidated guardhouse near the gate.", range_type="close")
-        factory_gate_road = Location("Factory Gate - Road", "The exposed road leading to the factory.", range_type="long")
+        factory_gate_main = add("Factory Gate - Main", "The primary entrance, heavily fortified.", range_type="medium")
+        factory_gate_guardhouse = add("Factory Gate - Guardhouse", "A small, dilapidated guardhouse near the gate.", range_type="close")
+        factory_gate_road = add("Factory Gate - Road", "The exposed road leading to the factory.", range_type="long")
 
         # Woods Area
-        woods_north_clearing = Location("Woods - North Clearing", "A quiet clearing in the northern woods.", range_type="long")
-        woods_south_clearing = Location("Woods - South Clearing", "A more open clearing, less dense forest.", range_type="medium")
-        woods_sniper_rock = Location("Woods - Sniper Rock", "A large rock formation offering a vantage point.", range_type="long")
-        woods_logging_camp = Location("Woods - Logging Camp", "An abandoned logging camp with scattered machinery.", range_type="medium")
+        woods_north_clearing = add("Woods - North Clearing", "A quiet clearing in the northern woods.", range_type="long")
+        woods_south_clearing = add("Woods - South Clearing", "A more open clearing, less dense forest.", range_type="medium")
+        woods_sniper_rock = add("Woods - Sniper Rock", "A large rock formation offering a vantage point.", range_type="long")
+        woods_logging_camp = add("Woods - Logging Camp", "An abandoned logging camp with scattered machinery.", range_type="medium")
 
         # Scav Camp Area
-        scav_camp_main = Location("Scav Camp - Main", "The central part of the scav camp, makeshift shelters.", range_type="close")
-        scav_camp_outskirts = Location("Scav Camp - Outskirts", "The less dense areas surrounding the main camp.", range_type="medium")
+        scav_camp_main = add("Scav Camp - Main", "The central part of the scav camp, makeshift shelters.", range_type="close")
+        scav_camp_outskirts = add("Scav Camp - Outskirts", "The less dense areas surrounding the main camp.", range_type="medium")
 
         # Old Gas Station Area
-        old_gas_station_main = Location("Old Gas Station - Main", "The main building of the gas station.", range_type="close")
-        old_gas_station_pumps = Location("Old Gas Station - Pumps", "The area around the fuel pumps, exposed.", range_type="medium")
+        old_gas_station_main = add("Old Gas Station - Main", "The main building of the gas station.", range_type="close")
+        old_gas_station_pumps = add("Old Gas Station - Pumps", "The area around the fuel pumps, exposed.", range_type="medium")
 
         # Trailer Park Area
-        trailer_park_north = Location("Trailer Park - North", "The northern section of the trailer park.", range_type="close")
-        trailer_park_south = Location("Trailer Park - South", "The southern section, more dilapidated trailers.", range_type="close")
+        trailer_park_north = add("Trailer Park - North", "The northern section of the trailer park.", range_type="close")
+        trailer_park_south = add("Trailer Park - South", "The southern section, more dilapidated trailers.", range_type="close")
 
         # Extraction Points
-        crossroads_extract = Location("Crossroads Extract", "A designated extraction point near the crossroads.", is_extraction_point=True, range_type="medium")
-        z_b_013_bunker = Location("ZB-013 Bunker", "An old military bunker, a reliable extraction point.", is_extraction_point=True, range_type="close")
-        rock_passage_extract = Location("Rock Passage Extract", "A narrow passage through rocks, another extraction point.", is_extraction_point=True, range_type="close")
-        tunnel_extract = Location("Tunnel Extract", "A dark, winding tunnel leading out of the area.", is_extraction_point=True, range_type="close")
+        crossroads_extract = add("Crossroads Extract", "A designated extraction point near the crossroads.", is_extraction_point=True, range_type="medium")
+        z_b_013_bunker = add("ZB-013 Bunker", "An old military bunker, a reliable extraction point.", is_extraction_point=True, range_type="close")
+        rock_passage_extract = add("Rock Passage Extract", "A narrow passage through rocks, another extraction point.", is_extraction_point=True, range_type="close")
+        tunnel_extract = add("Tunnel Extract", "A dark, winding tunnel leading out of the area.", is_extraction_point=True, range_type="close")
 
         # New Major Locations (with sub-locations)
         # Construction Site Area
-        construction_site_crane = Location("Construction Site - Crane", "Area around the towering construction crane.", range_type="medium")
-        construction_site_foundations = Location("Construction Site - Foundations", "The muddy, rebar-filled foundations of a new building.", range_type="close")
-        construction_site_warehouse = Location("Construction Site - Warehouse", "A partially built warehouse structure.", range_type="medium")
+        construction_site_crane = add("Construction Site - Crane", "Area around the towering construction crane.", range_type="medium")
+        construction_site_foundations = add("Construction Site - Foundations", "The muddy, rebar-filled foundations of a new building.", range_type="close")
+        construction_site_warehouse = add("Construction Site - Warehouse", "A partially built warehouse structure.", range_type="medium")
 
         # Power Station Area
-        power_station_turbine_hall = Location("Power Station - Turbine Hall", "The massive, echoing turbine hall.", range_type="medium")
-        power_station_control_room = Location("Power Station - Control Room", "A small, abandoned control room.", range_type="close")
-        power_station_cooling_towers = Location("Power Station - Cooling Towers", "The base of the massive cooling towers.", range_type="long")
+        power_station_turbine_hall = add("Power Station - Turbine Hall", "The massive, echoing turbine hall.", range_type="medium")
+        power_station_control_room = add("Power Station - Control Room", "A small, abandoned control room.", range_type="close")
+        power_station_cooling_towers = add("Power Station - Cooling Towers", "The base of the massive cooling towers.", range_type="long")
 
         # Swamp Area
-        swamp_main = Location("Swamp - Main", "The deepest part of the murky swamp.", range_type="long")
-        swamp_outskirts = Location("Swamp - Outskirts", "The edges of the swamp, less dense.", range_type="medium")
+        swamp_main = add("Swamp - Main", "The deepest part of the murky swamp.", range_type="long")
+        swamp_outskirts = add("Swamp - Outskirts", "The edges of the swamp, less dense.", range_type="medium")
 
         # Village Area
-        village_center = Location("Village - Center", "The main square of the abandoned village.", range_type="close")
-        village_houses = Location("Village - Houses", "Scattered, dilapidated houses.", range_type="close")
+        village_center = add("Village - Center", "The main square of the abandoned village.", range_type="close")
+        village_houses = add("Village - Houses", "Scattered, dilapidated houses.", range_type="close")
 
         # Resort Area
-        resort_east_wing = Location("Resort - East Wing", "The opulent but decaying east wing of the resort.", range_type="close")
-        resort_west_wing = Location("Resort - West Wing", "The equally grand but dangerous west wing.", range_type="close")
-        resort_admin_building = Location("Resort - Admin Building", "The central administration building.", range_type="medium")
-        resort_pool_area = Location("Resort - Pool Area", "A derelict outdoor pool area.", range_type="medium")
+        resort_east_wing = add("Resort - East Wing", "The opulent but decaying east wing of the resort.", range_type="close")
+        resort_west_wing = add("Resort - West Wing", "The equally grand but dangerous west wing.", range_type="close")
+        resort_admin_building = add("Resort - Admin Building", "The central administration building.", range_type="medium")
+        resort_pool_area = add("Resort - Pool Area", "A derelict outdoor pool area.", range_type="medium")
 
         # Shoreline Road Area
-        shoreline_north_road = Location("Shoreline Road - North", "The northern stretch of the coastal road.", range_type="long")
-        shoreline_south_road = Location("Shoreline Road - South", "The southern, more winding part of the road.", range_type="long")
-        shoreline_bus_station = Location("Shoreline Road - Bus Station", "An abandoned bus stop along the road.", range_type="medium")
+        shoreline_north_road = add("Shoreline Road - North", "The northern stretch of the coastal road.", range_type="long")
+        shoreline_south_road = add("Shoreline Road - South", "The southern, more winding part of the road.", range_type="long")
+        shoreline_bus_station = add("Shoreline Road - Bus Station", "An abandoned bus stop along the road.", range_type="medium")
 
         # Lighthouse Area
-        lighthouse_base = Location("Lighthouse - Base", "The rocky base of the lighthouse.", range_type="medium")
-        lighthouse_summit = Location("Lighthouse - Summit", "The top of the lighthouse, commanding views.", range_type="long")
-        lighthouse_pier = Location("Lighthouse - Pier", "A small, broken pier extending into the water.", range_type="medium")
+        lighthouse_base = add("Lighthouse - Base", "The rocky base of the lighthouse.", range_type="medium")
+        lighthouse_summit = add("Lighthouse - Summit", "The top of the lighthouse, commanding views.", range_type="long")
+        lighthouse_pier = add("Lighthouse - Pier", "A small, broken pier extending into the water.", range_type="medium")
 
         # Military Base Area
-        military_base_barracks = Location("Military Base - Barracks", "Dilapidated barracks buildings.", range_type="close")
-        military_base_main_gate = Location("Military Base - Main Gate", "The heavily fortified main gate.", range_type="medium")
-        military_base_bunker_complex = Location("Military Base - Bunker Complex", "An underground bunker network.", range_type="close")
-        military_base_heli_crash = Location("Military Base - Heli Crash", "The site of a downed helicopter.", range_type="medium")
-
-
-        # Add all locations to map dictionary
-        self.map = {loc.name: loc for loc in [
-            customs_main, customs_east_wing, customs_west_wing, customs_storage,
-            dorms_2_story, dorms_3_story, dorms_courtyard, dorms_boiler_room,
-            factory_gate_main, factory_gate_guardhouse, factory_gate_road,
-            woods_north_clearing, woods_south_clearing, woods_sniper_rock, woods_logging_camp,
-            scav_camp_main, scav_camp_outskirts,
-            old_gas_station_main, old_gas_station_pumps,
-            trailer_park_north, trailer_park_south,
-            crossroads_extract, z_b_013_bunker, rock_passage_extract, tunnel_extract,
-            construction_site_crane, construction_site_foundations, construction_site_warehouse,
-            power_station_turbine_hall, power_station_control_room, power_station_cooling_towers,
-            swamp_main, swamp_outskirts,
-            village_center, village_houses,
-            resort_east_wing, resort_west_wing, resort_admin_building, resort_pool_area,
-            shoreline_north_road, shoreline_south_road, shoreline_bus_station,
-            lighthouse_base, lighthouse_summit, lighthouse_pier,
-            military_base_barracks, military_base_main_gate, military_base_bunker_complex, military_base_heli_crash
-        ]}
+        military_base_barracks = add("Military Base - Barracks", "Dilapidated barracks buildings.", range_type="close")
+        military_base_main_gate = add("Military Base - Main Gate", "The heavily fortified main gate.", range_type="medium")
+        military_base_bunker_complex = add("Military Base - Bunker Complex", "An underground bunker network.", range_type="close")
+        military_base_heli_crash = add("Military Base - Heli Crash", "The site of a downed helicopter.", range_type="medium")
 
         # Define exits - creating a more interconnected web
         # Customs connections
@@ -692,67 +1379,32 @@ class Game:
         military_base_heli_crash.add_exit("east", military_base_main_gate) # Example connection
 
 
+    def _set_storage(self, items):
+        """Replaces the hideout storage list and recounts its weight."""
+        self.hideout_storage = items
+        self._storage_weight = round(sum(map(_WEIGHT, items)), 2)
+
+    def _storage_add(self, item):
+        self.hideout_storage.append(item)
+        self._storage_weight = round(self._storage_weight + item.weight, 2) # Same 0.05kg rounding as Player._adjust_weight
+
+    def _storage_remove(self, item):
+        self.hideout_storage.remove(item)
+        self._storage_weight = round(self._storage_weight - item.weight, 2)
+
+    def _register_item(self, item):
+        """Records an item prototype in item_database under its name and returns it."""
+        self.item_database[item.name] = item
+        return item
+
     def _initialize_game_state(self):
         """Sets up initial items and enemies in the world, and loads/saves hideout state."""
-        # Define all items as attributes of 'self' and populate item_database
-        self.pistol = Weapon("Makarov PM", "A common sidearm, reliable in close quarters.", damage=15, weight=1.5, effective_range_type="short", caliber="9x18mm Makarov", value=5000)
-        self.ak74n = Weapon("AK-74N", "A standard-issue assault rifle, known for its versatility.", damage=30, weight=4, effective_range_type="medium", caliber="5.45x39mm", value=35000)
-        self.shotgun = Weapon("MP-153", "A devastating shotgun, effective at very close range.", damage=40, weight=3.5, effective_range_type="very_short", caliber="12 gauge", value=20000)
-        self.knife = Weapon("Combat Knife", "A simple, sharp blade for desperate situations.", damage=10, weapon_type="melee", weight=0.5, effective_range_type="very_short", caliber="N/A", value=1500)
-        self.mosin = Weapon("Mosin", "A vintage bolt-action rifle, capable of long-range precision.", damage=50, weight=6, effective_range_type="long", caliber="7.62x54mmR", value=40000)
-        self.mp5 = Weapon("MP5", "A compact submachine gun with a high rate of fire.", damage=25, weight=3, effective_range_type="short", caliber="9x19mm Parabellum", value=28000)
-        self.akm = Weapon("AKM", "A robust assault rifle, favored for its stopping power.", damage=35, weight=4.5, effective_range_type="medium", caliber="7.62x39mm", value=40000)
-        self.m4a1 = Weapon("M4A1", "A modern assault rifle, highly customizable and accurate.", damage=32, weight=3.8, effective_range_type="medium", caliber="5.56x45mm NATO", value=55000)
-        self.svd = Weapon("SVD", "A powerful designated marksman rifle, ideal for long-distance engagements.", damage=60, weight=7, effective_range_type="long", caliber="7.62x54mmR", value=80000)
-        self.toz_106 = Weapon("TOZ-106", "A sawed-off shotgun, highly lethal up close but limited range.", damage=35, weight=2, effective_range_type="very_short", caliber="12 gauge", value=8000)
-        self.vpo_209 = Weapon("VPO-209", "A civilian hunting rifle, decent power and range.", damage=28, weight=3.5, effective_range_type="medium", caliber=".366 TKM", value=15000)
-        self.tt_pistol = Weapon("TT Pistol", "An old but reliable semi-automatic pistol.", damage=18, weight=1, effective_range_type="short", caliber="7.62x25mm TT", value=6000)
-        self.pm_silenced = Weapon("PM (Silenced)", "A Makarov pistol with a crude suppressor.", damage=16, weight=1.8, effective_range_type="short", caliber="9x18mm Makarov", value=7000)
-
-        self.paca_armor = Armor("PACA Body Armor", "Basic soft armor vest.", defense=5, slot="body", weight=5, value=12000)
-        self.kirasa_armor = Armor("Kirasa Armor", "Medium-grade body armor.", defense=10, slot="body", weight=8, value=25000)
-        self.gen4_armor = Armor("Gen4 Armor", "Heavy-duty modular armor.", defense=15, slot="body", weight=12, value=60000)
-        self.ssh68_helmet = Armor("SSh-68 Helmet", "A basic steel helmet.", defense=3, slot="head", weight=2, value=8000)
-        self.kolpak_helmet = Armor("Kolpak-1 Helmet", "A simple protective helmet.", defense=5, slot="head", weight=3, value=15000)
-        self.altyn_helmet = Armor("Altyn Helmet", "Heavy-duty titanium helmet with faceshield.", defense=12, slot="head", weight=7, value=85000)
-        self.tarbank_armor = Armor("Tarbank Armor", "Light civilian body armor.", defense=4, slot="body", weight=4, value=10000)
-        self.un_helmet = Armor("UN Helmet", "A simple, light-duty helmet.", defense=2, slot="head", weight=1.5, value=5000)
-        self.beanie = Armor("Beanie", "A knitted hat. Offers no protection.", defense=0, slot="head", weight=0.1, value=500)
-
-        self.medkit = Consumable("AI-2 Medkit", "A basic medical kit.", effect_type="heal", effect_value=50, weight=0.5, value=3000)
-        self.painkillers = Consumable("Painkillers", "Reduces pain, restores some health.", effect_type="heal", effect_value=20, weight=0.2, value=1500) # Changed from stamina_restore to heal
-        self.morphine = Consumable("Morphine", "Strong painkiller.", effect_type="heal", effect_value=40, weight=0.1, value=4000)
-        self.water_bottle = Consumable("Water Bottle", "Quenches thirst.", effect_type="stamina_restore", effect_value=20, weight=0.3, value=800)
-        self.bandage = Consumable("Bandage", "Stops light bleeding.", effect_type="cure_bleeding", effect_value=0, weight=0.1, value=500)
-        self.esmarch = Consumable("Esmarch Tourniquet", "Stops heavy bleeding.", effect_type="cure_bleeding", effect_value=0, weight=0.1, value=1200)
-        self.grizzly_medkit = Consumable("Grizzly Medkit", "A comprehensive medical kit.", effect_type="heal", effect_value=100, weight=1.5, value=10000)
-        self.energy_drink = Consumable("Energy Drink", "Boosts stamina significantly.", effect_type="stamina_restore", effect_value=50, weight=0.3, value=2000)
-        self.alyonka_chocolate = Consumable("Alyonka Chocolate", "A sweet treat, provides a small stamina boost.", effect_type="stamina_restore", effect_value=15, weight=0.1, value=700)
-        self.can_of_sprats = Consumable("Can of Sprats", "A small can of fish, provides minor stamina.", effect_type="stamina_restore", effect_value=10, weight=0.2, value=600) # Changed from heal to stamina_restore
-        
-        
-        self.spark_plug = Item("Spark Plug", "A small engine part.", weight=0.1, value=1000)
-        self.wires = Item("Wires", "A coil of electrical wires.", weight=0.2, value=800)
-        self.ammunition = Item("Ammunition", "5.45x39mm rounds.", weight=0.3, value=1500) # Representing a small pack
-        self.valuable_item = Item("Valuable Item", "A rare and valuable trinket.", weight=0.5, value=25000)
-        self.grenade = Item("Grenade", "A fragmentation grenade.", weight=0.4, value=4000)
-        self.gold_chain = Item("Gold Chain", "A valuable gold chain.", weight=0.1, value=15000)
-        self.wrench = Item("Wrench", "A rusty wrench.", weight=1, value=900)
-        self.matches = Item("Matches", "A box of matches.", weight=0.1, value=100)
-        self.chocolate_bar = Consumable("Chocolate Bar", "A sugary treat.", effect_type="stamina_restore", effect_value=10, weight=0.1, value=500)
-        self.mre = Consumable("MRE", "Meal Ready-to-Eat. Restores stamina.", effect_type="stamina_restore", effect_value=30, weight=0.8, value=2500) # Changed from heal to stamina_restore
-        self.lighter = Item("Lighter", "A simple disposable lighter.", weight=0.05, value=200)
-        self.broken_lcd = Item("Broken LCD", "A shattered LCD screen.", weight=0.2, value=1200)
-        self.keycard = Item("Keycard", "A valuable keycard.", weight=0.05, value=50000)
-        self.screwdriver = Item("Screwdriver", "A common tool.", weight=0.3, value=700)
-        self.bolts = Item("Bolts", "A handful of assorted bolts.", weight=0.2, value=300) # Added bolts
-        self.nuts = Item("Nuts", "A handful of assorted nuts.", weight=0.2, value=300) # Added nuts
-
-        # Populate item database for lookup
-        for attr_name in dir(self):
-            attr = getattr(self, attr_name)
-            if isinstance(attr, Item):
-                self.item_database[attr.name] = attr
+        # Define all items as attributes of 'self'; each is the single shared instance of its kind
+        add = self._register_item
+        for item_class, specs in ((Weapon, _WEAPON_SPECS), (Armor, _ARMOR_SPECS),
+                                  (Consumable, _CONSUMABLE_SPECS), (Item, _ITEM_SPECS)):
+            for attr_name, *args in specs:
+                setattr(self, attr_name, add(item_class(*args)))
 
         self._load_hideout_state() # Load player data and hideout storage
 
@@ -760,51 +1412,34 @@ class Game:
         # Player only gets starting gear if raid_count is 0 AND their inventory/equips are empty
         if self.raid_count == 0 and not self.player.inventory and \
            not self.player.equipped_weapon and not self.player.equipped_armor and not self.player.equipped_helmet:
-            self.player.add_item(self.akm)
-            self.player.equip_weapon(self.akm)
-            self.player.add_item(self.kirasa_armor)
-            self.player.equip_armor(self.kirasa_armor)
-            self.player.add_item(self.kolpak_helmet)
-            self.player.equip_armor(self.kolpak_helmet)
-            self.player.add_item(self.medkit)
-            self.player.add_item(self.medkit)
-            self.player.add_item(self.bandage)
-            self.player.add_item(self.esmarch)
-            self.player.add_item(self.painkillers)
-            self.player.roubles = 10000 # Starting roubles for new games
+            player = self.player
+            give, equip_weapon, equip_armor = player.add_item, player.equip_weapon, player.equip_armor
+            kit_messages = []
+            player.buffer_messages(kit_messages)
+            give(self.akm)
+            equip_weapon(self.akm)
+            give(self.kirasa_armor)
+            equip_armor(self.kirasa_armor)
+            give(self.kolpak_helmet)
+            equip_armor(self.kolpak_helmet) # Helmets go through equip_armor too; it picks the slot from armor.slot
+            give(self.medkit)
+            give(self.medkit)
+            give(self.bandage)
+            give(self.esmarch)
+            give(self.painkillers)
+            player.buffer_messages(None)
+            _emit(kit_messages)
+            player.roubles = 10000 # Starting roubles for new games
 
         # Place some static loot in various sub-locations
-        self.map["Dormitories - 2 Story"].add_item(self.ak74n)
-        self.map["Dormitories - 3 Story"].add_item(self.medkit)
-        self.map["Factory Gate - Guardhouse"].add_item(self.shotgun)
-        self.map["Scav Camp - Main"].add_item(self.paca_armor)
-        self.map["Old Gas Station - Main"].add_item(self.painkillers)
-        self.map["Woods - North Clearing"].add_item(self.water_bottle)
-        self.map["Trailer Park - North"].add_item(self.kirasa_armor)
-        self.map["Construction Site - Foundations"].add_item(self.mosin)
-        self.map["Power Station - Turbine Hall"].add_item(self.gen4_armor)
-        self.map["Village - Center"].add_item(self.mp5)
-        self.map["Swamp - Main"].add_item(self.esmarch)
-        self.map["Resort - East Wing"].add_item(self.m4a1)
-        self.map["Resort - West Wing"].add_item(self.altyn_helmet)
-        self.map["Military Base - Bunker Complex"].add_item(self.svd)
-        self.map["Military Base - Heli Crash"].add_item(self.grizzly_medkit)
-        self.map["Lighthouse - Summit"].add_item(self.akm)
-        self.map["Shoreline Road - South"].add_item(self.kolpak_helmet)
-        self.map["Shoreline Road - Bus Station"].add_item(self.energy_drink)
-
+        world = self.map
+        for location_name, item_attr in _GROUND_LOOT:
+            world[location_name].add_item(getattr(self, item_attr))
 
         # Add containers with loot in various sub-locations
-        self.map["Dormitories - 2 Story"].add_container(Container("Duffle Bag", "A worn-out duffle bag.", items=[self.painkillers, self.spark_plug]))
-        self.map["Factory Gate - Main"].add_container(Container("Wooden Crate", "A sturdy wooden crate, probably used for shipping.", items=[self.bandage, self.wires]))
-        self.map["Power Station - Control Room"].add_container(Container("Weapon Box", "A military-grade weapon box.", items=[self.ak74n, self.ammunition]))
-        self.map["Village - Houses"].add_container(Container("Shed Stash", "A hidden stash in an old shed.", items=[self.medkit, self.valuable_item]))
-        self.map["Resort - Admin Building"].add_container(Container("Medical Bag", "A large medical bag.", items=[self.grizzly_medkit, self.esmarch, self.morphine]))
-        self.map["Military Base - Barracks"].add_container(Container("Weapon Crate", "A sealed military weapon crate.", items=[self.m4a1, self.svd, self.grenade]))
-        self.map["Lighthouse - Base"].add_container(Container("Supply Cache", "A small, waterproof supply cache.", items=[self.akm, self.gold_chain]))
-        self.map["Customs Office - Storage"].add_container(Container("Toolbox", "A dusty metal toolbox.", items=[self.bolts, self.nuts, self.screwdriver]))
-        self.map["Woods - Logging Camp"].add_container(Container("Wooden Box", "A simple wooden box.", items=[self.alyonka_chocolate, self.can_of_sprats]))
-
+        for location_name, container_name, description, item_attrs in _CONTAINER_SPECS:
+            items = [getattr(self, item_attr) for item_attr in item_attrs]
+            world[location_name].add_container(Container(container_name, description, items=items))
 
         # Define common loot items for scavs (expanded)
         self.scav_common_loot = [
@@ -830,6 +1465,18 @@ class Game:
         self.armored_scav_armor = [self.kirasa_armor, self.gen4_armor]
         self.armored_scav_helmets = [self.kolpak_helmet, self.altyn_helmet, self.ssh68_helmet]
 
+        # Gear pools for USEC PMCs / Elite Scavs, built once rather than per spawn
+        # (SVD and M4A1 are listed on top of the armored scav weapons, so they come up twice as often)
+        self.elite_weapons = tuple(self.armored_scav_weapons + [self.svd, self.m4a1]) # Higher tier weapons
+        self.elite_armor = (self.gen4_armor, self.kirasa_armor)
+        self.elite_helmets = (self.altyn_helmet, self.kolpak_helmet)
+
+        # _ENEMY_ARCHETYPES rows with the gear pool names resolved, for _spawn_random_enemies
+        self._enemy_archetypes = tuple(
+            (names, health, damage, hit_chance, loot_count) + tuple(getattr(self, pool) for pool in pools) + (article,)
+            for names, health, damage, hit_chance, loot_count, pools, article in _ENEMY_ARCHETYPES
+        )
+
         # Shop inventory
         self.shop_inventory = [
             self.medkit, self.painkillers, self.bandage, self.esmarch, self.water_bottle,
@@ -847,14 +1494,14 @@ class Game:
         """
         data_to_save = {
             "player_roubles": self.player.roubles,
-            "hideout_storage": [item.name for item in self.hideout_storage],
+            "hideout_storage": list(map(_NAME, self.hideout_storage)),
             "player_health": self.player.current_health,
             "player_stamina": self.player.current_stamina,
             "player_is_bleeding": self.player.is_bleeding,
             "raid_count": self.raid_count,
         }
         if save_equipped_items:
-            data_to_save["player_inventory"] = [item.name for item in self.player.inventory]
+            data_to_save["player_inventory"] = list(map(_NAME, self.player.inventory))
             data_to_save["equipped_weapon"] = self.player.equipped_weapon.name if self.player.equipped_weapon else None
             data_to_save["equipped_armor"] = self.player.equipped_armor.name if self.player.equipped_armor else None
             data_to_save["equipped_helmet"] = self.player.equipped_helmet.name if self.player.equipped_helmet else None
@@ -866,11 +1513,12 @@ class Game:
             data_to_save["equipped_helmet"] = None
 
         try:
+            saved_text = json.dumps(data_to_save, indent=4) # json.dump would issue one write() per encoded fragment
             with open("hideout_data.json", "w") as f:
-                json.dump(data_to_save, f, indent=4)
-            print("Hideout state saved.")
+                f.write(saved_text)
+            logger.info("Hideout state saved.")
         except IOError as e:
-            print(f"Error saving hideout state: {e}")
+            logger.error("Error saving hideout state: %s", e)
 
     def _load_hideout_state(self):
         """Loads the player's hideout state from a JSON file."""
@@ -887,62 +1535,63 @@ class Game:
                 self.raid_count = loaded_data.get("raid_count", 0) # Load raid count, default to 0
 
                 # Load inventory and storage, re-instantiating items
-                self.player.inventory = []
-                for item_name in loaded_data.get("player_inventory", []):
-                    item = self.item_database.get(item_name)
+                item_database = self.item_database
+                get_item = item_database.get # Bound once; both restore loops call it per saved name
+                loaded_inventory = []
+                append = loaded_inventory.append
+                for item_name in loaded_data.get("player_inventory", ()):
+                    item = get_item(item_name)
                     if item:
-                        self.player.inventory.append(item)
+                        append(item)
                     else:
-                        print(f"Warning: Item '{item_name}' not found in database during inventory load.")
+                        logger.warning("Item '%s' not found in database during inventory load.", item_name)
+                self.player.set_inventory(loaded_inventory)
 
-                self.hideout_storage = []
-                for item_name in loaded_data.get("hideout_storage", []):
-                    item = self.item_database.get(item_name)
+                loaded_storage = []
+                append = loaded_storage.append
+                for item_name in loaded_data.get("hideout_storage", ()):
+                    item = get_item(item_name)
                     if item:
-                        self.hideout_storage.append(item)
+                        append(item)
                     else:
-                        print(f"Warning: Item '{item_name}' not found in database during storage load.")
+                        logger.warning("Item '%s' not found in database during storage load.", item_name)
+                self._set_storage(loaded_storage)
 
                 # Equip items (ensure they are removed from inventory/storage if they were loaded there)
                 # Only load equipped items if they were explicitly saved (i.e., not a raid start save)
-                equipped_weapon_name = loaded_data.get("equipped_weapon")
-                if equipped_weapon_name and equipped_weapon_name in self.item_database:
-                    weapon = self.item_database[equipped_weapon_name]
-                    # Remove from inventory/storage first if it somehow got loaded there
-                    self.player.inventory = [i for i in self.player.inventory if i.name != weapon.name]
-                    self.hideout_storage = [i for i in self.hideout_storage if i.name != weapon.name]
+                weapon = item_database.get(loaded_data.get("equipped_weapon") or "")
+                armor = item_database.get(loaded_data.get("equipped_armor") or "")
+                helmet = item_database.get(loaded_data.get("equipped_helmet") or "")
+
+                # Remove equipped items from inventory/storage first if they somehow got loaded there
+                equipped_names = {item.name for item in (weapon, armor, helmet) if item}
+                if equipped_names:
+                    self.player.set_inventory([i for i in self.player.inventory if i.name not in equipped_names])
+                    self._set_storage([i for i in self.hideout_storage if i.name not in equipped_names])
+
+                if weapon:
                     self.player.equip_weapon(weapon)
                 else:
-                    self.player.equipped_weapon = None # Ensure it's None if not found/equipped or not saved
-
-                equipped_armor_name = loaded_data.get("equipped_armor")
-                if equipped_armor_name and equipped_armor_name in self.item_database:
-                    armor = self.item_database[equipped_armor_name]
-                    self.player.inventory = [i for i in self.player.inventory if i.name != armor.name]
-                    self.hideout_storage = [i for i in self.hideout_storage if i.name != armor.name]
+                    self.player.clear_slot("weapon") # Ensure it's None if not found/equipped or not saved
+                if armor:
                     self.player.equip_armor(armor)
                 else:
-                    self.player.equipped_armor = None
-
-                equipped_helmet_name = loaded_data.get("equipped_helmet")
-                if equipped_helmet_name and equipped_helmet_name in self.item_database:
-                    helmet = self.item_database[equipped_helmet_name]
-                    self.player.inventory = [i for i in self.player.inventory if i.name != helmet.name]
-                    self.hideout_storage = [i for i in self.hideout_storage if i.name != helmet.name]
+                    self.player.clear_slot("armor")
+                if helmet:
                     self.player.equip_armor(helmet) # equip_armor handles both slots
                 else:
-                    self.player.equipped_helmet = None
+                    self.player.clear_slot("helmet")
 
-                print("Hideout state loaded.")
+                logger.info("Hideout state loaded.")
             except json.JSONDecodeError as e:
-                print(f"Error loading hideout state (JSON decode error): {e}. Starting fresh.")
+                logger.error("Error loading hideout state (JSON decode error): %s. Starting fresh.", e)
                 self.player.roubles = 10000 # Default if file corrupted
-                self.hideout_storage = []
+                self._set_storage([])
                 self.raid_count = 0 # Reset raid count on corrupted file
             except Exception as e:
-                print(f"An unexpected error occurred during hideout state load: {e}. Starting fresh.")
+                logger.error("An unexpected error occurred during hideout state load: %s. Starting fresh.", e)
                 self.player.roubles = 10000
-                self.hideout_storage = []
+                self._set_storage([])
                 self.raid_count = 0 # Reset raid count on error
         else:
             print("No saved hideout data found. Starting a new game.")
@@ -950,49 +1599,47 @@ class Game:
 
     def display_location(self):
         """Displays information about the current location."""
-        print(f"\n--- You are in the {self.current_location.name} ---")
-        print(self.current_location.description)
-        print(f"Combat Range: {self.current_location.range_type.capitalize()}")
-
-        if self.current_location.items:
-            print("\nItems on the ground:")
-            for item in self.current_location.items:
-                print(f"- {item.get_info()}")
-
-        if self.current_location.containers:
-            print("\nContainers present:")
-            for container in self.current_location.containers:
-                print(f"- {container.get_info()}")
-
-        if self.current_location.enemies:
-            print("\nEnemies present:")
-            for enemy in self.current_location.enemies:
-                print(f"- {Colors.RED}{enemy.name}{Colors.RESET}")
+        loc = self.current_location
+        out = [
+            f"\n--- You are in the {loc.name} ---",
+            loc.description,
+            f"Combat Range: {loc.range_type.capitalize()}",
+        ]
+        say = out.append
+
+        if loc.items:
+            say("\nItems on the ground:")
+            out.extend([f"- {item.get_info()}" for item in loc.items])
+
+        if loc.containers:
+            say("\nContainers present:")
+            out.extend([f"- {container.get_info()}" for container in loc.containers])
+
+        if loc.enemies:
+            say("\nEnemies present:")
+            out.extend([f"- {enemy.colored_name}" for enemy in loc.enemies])
         else:
-            print("\nNo enemies detected.")
+            say("\nNo enemies detected.")
 
-        print("\nExits:")
-        for direction, location in self.current_location.exits.items():
-            print(f"- {direction.capitalize()} to {location.name}")
-        print("-----------------------------------")
-        self.current_location.visited = True
+        say("\nExits:")
+        if loc.get_exit_directions():
+            say(loc.get_exits_text())
+        say("-----------------------------------")
+        _emit(out)
+        self._visited_mask |= 1 << loc.id
 
     def _fuzzy_find_item_in_lists(self, item_name_input, item_lists_to_search):
         """
         Helper function to perform fuzzy matching for items across multiple lists.
         Returns the matched item, or None if no unique match or user cancels.
         """
-        all_possible_items = []
+        prefix = item_name_input.lower()
+        matches = []
         for item_list in item_lists_to_search:
             if isinstance(item_list, list):
-                all_possible_items.extend(item_list)
-            elif item_list is not None:
-                all_possible_items.append(item_list)
-        
-        matches = []
-        for item in all_possible_items:
-            if item and item.name.lower().startswith(item_name_input.lower()):
-                matches.append(item)
+                matches.extend([item for item in item_list if item and item._name_lc.startswith(prefix)])
+            elif item_list is not None and item_list._name_lc.startswith(prefix):
+                matches.append(item_list)
         
         if len(matches) == 1:
             return matches[0]
@@ -1028,70 +1675,24 @@ class Game:
 
     def _handle_raid_commands(self, original_command):
         """Handles commands when the player is in a raid."""
-        command = original_command # Use original_command for alias/fuzzy matching
-        if original_command in self.command_aliases:
-            command = self.command_aliases[original_command]
-        else:
-            main_commands = ["move", "look", "get", "drop", "equip", "use", "attack", "inventory", "stats", "search", "extract", "help", "quit", "examine", "rest", "flee"]
-            command_parts = original_command.split(maxsplit=1)
-            action_prefix = command_parts[0]
-            
-            matching_commands = [cmd for cmd in main_commands if cmd.startswith(action_prefix)]
-
-            if len(matching_commands) == 1:
-                command = matching_commands[0] + (" " + (command_parts[1] if len(command_parts) > 1 else ""))
-                print(f"(Autocompleted to: {command})")
-            elif len(matching_commands) > 1:
-                print(f"Ambiguous command. Did you mean: {', '.join(matching_commands)}?")
-                return
-
-        command_parts = command.split(maxsplit=1)
-        action = command_parts[0]
-        arg = command_parts[1] if len(command_parts) > 1 else ""
+        action, arg, notice = _parse_raid_command(original_command)
+        if notice is not None:
+            print(notice)
+        if action is None:
+            return
 
         valid_action_performed = False
 
-        if action == "move":
-            self.move_player(arg)
-            valid_action_performed = True
-        elif action == "look":
-            self.display_location()
-            valid_action_performed = True
-        elif action == "get":
-            self.get_item(arg)
-            valid_action_performed = True
-        elif action == "drop":
-            self.drop_item(arg)
-            valid_action_performed = True
-        elif action == "equip":
-            self.equip_item(arg)
-            valid_action_performed = True
-        elif action == "use":
-            self.use_item(arg)
-            valid_action_performed = True
-        elif action == "attack":
-            self.attack_enemy(arg)
-            valid_action_performed = True
-        elif action == "inventory" or action == "inv":
-            self.player.display_inventory()
-            valid_action_performed = True
-        elif action == "stats":
-            self.player.display_stats()
-            valid_action_performed = True
-        elif action == "search":
-            self.search_container(arg)
-            valid_action_performed = True
-        elif action == "examine":
-            self.examine_item(arg)
-            valid_action_performed = True
-        elif action == "rest":
-            self.rest_player()
+        handler = self._raid_handlers.get(action)
+        if handler is not None:
+            func, takes_arg = handler
+            if takes_arg:
+                func(arg)
+            else:
+                func()
             valid_action_performed = True
         elif action == "flee":
             print("You can only 'flee' during combat.") # Flee is handled inside combat_round
-        elif action == "extract":
-            self.check_extraction()
-            valid_action_performed = True
         elif action == "help":
             self.display_help()
         elif action == "quit":
@@ -1109,56 +1710,24 @@ class Game:
 
         if self.player.is_bleeding:
             bleeding_damage = random.randint(2, 5)
-            self.player.take_damage(bleeding_damage, hit_location="body")
-            print(f"You are bleeding, taking {bleeding_damage} damage. Your Health: {self.player._get_health_status()}")
+            self._take_damage(bleeding_damage, hit_location="body")
+            print(_BLEED_LINE % (bleeding_damage, self.player._get_health_status()))
 
     def _handle_hideout_commands(self, original_command):
         """Handles commands when the player is in the hideout."""
-        command = original_command
-        if original_command in self.command_aliases:
-            command = self.command_aliases[original_command]
-        else:
-            hideout_commands = ["shop", "storage", "start_raid", "stats", "inventory", "help", "quit", "examine", "put", "take", "reset", "equip", "remove"] # Added reset, equip, remove
-            command_parts = original_command.split(maxsplit=1)
-            action_prefix = command_parts[0]
-            
-            matching_commands = [cmd for cmd in hideout_commands if cmd.startswith(action_prefix)]
-
-            if len(matching_commands) == 1:
-                command = matching_commands[0] + (" " + (command_parts[1] if len(command_parts) > 1 else ""))
-                print(f"(Autocompleted to: {command})")
-            elif len(matching_commands) > 1:
-                print(f"Ambiguous command. Did you mean: {', '.join(matching_commands)}?")
-                return
+        action, arg, notice = _parse_hideout_command(original_command)
+        if notice is not None:
+            print(notice)
+        if action is None:
+            return
 
-        command_parts = command.split(maxsplit=1)
-        action = command_parts[0]
-        arg = command_parts[1] if len(command_parts) > 1 else ""
-
-        if action == "shop":
-            self._handle_shop_interface()
-        elif action == "storage":
-            self._handle_storage_interface()
-        elif action == "start_raid":
-            self._start_raid()
-        elif action == "inventory" or action == "inv":
-            self.player.display_inventory()
-        elif action == "stats":
-            self.player.display_stats()
-        elif action == "examine":
-            self.examine_item_in_hideout(arg)
-        elif action == "put":
-            self._put_item_in_storage() # Removed arg, it will be prompted inside
-        elif action == "take":
-            self._take_item_from_storage() # Removed arg, it will be prompted inside
-        elif action == "equip": # New equip command in hideout
-            self._equip_item_in_hideout(arg)
-        elif action == "remove": # New remove (unequip) command in hideout
-            self._remove_equipped_item_in_hideout(arg)
-        elif action == "reset": # Handle reset command
-            self._reset_game_data()
-        elif action == "help":
-            self.display_hideout_help()
+        handler = self._hideout_handlers.get(action)
+        if handler is not None:
+            func, takes_arg = handler
+            if takes_arg:
+                func(arg)
+            else:
+                func()
         elif action == "quit":
             self._save_hideout_state(save_equipped_items=True) # Save with equipped items when quitting from hideout
             self.game_over = True
@@ -1167,53 +1736,40 @@ class Game:
 
     def display_hideout_help(self):
         """Displays available commands in the hideout."""
-        print("\n--- Hideout Commands ---")
-        print("shop (or sh) - Access the trader to buy and sell items.")
-        print("storage (or st) - Manage your personal hideout storage.")
-        print("start_raid (or sr) - Begin a new raid into Tarkov.")
-        print("inventory (or inv) - View your currently held inventory.")
-        print("stats (or stat) - View your player stats.")
-        print("equip [item name] - Equip a weapon, body armor, or helmet from your inventory.") # Added equip
-        print("remove [item name] - Remove an equipped weapon, body armor, or helmet and place it in your inventory.") # Added remove
-        print("examine [item name] (or ex) - View detailed information about an item in your inventory or storage.")
-        print("put - Move an item from your inventory to hideout storage (you will be prompted for item name).")
-        print("take - Move an item from hideout storage to your inventory (you will be prompted for item name).")
-        print("reset - Delete all save data and start a new game.")
-        print("help (or h) - Display this list of commands.")
-        print("quit (or q) - Save game and exit.")
-        print("--------------------------")
+        print(_HIDEOUT_HELP_TEXT)
 
     def _handle_shop_interface(self):
         """Manages the shop interface for buying and selling items."""
         print("\n--- Trader Shop ---")
         print(f"Your Roubles: {self.player.roubles}₽")
+        shop_handlers = self._shop_handlers
         while True:
             print("\nShop Options: (list/buy [item]/sell [item]/exit)")
             shop_command = input("What would you like to do? ").lower().strip()
 
-            if shop_command.startswith("list"):
-                print("\n--- Items for Sale ---")
-                if not self.shop_inventory:
-                    print("The shop is currently out of stock.")
+            action, _, item_name_input = shop_command.partition(" ")
+            handler = shop_handlers.get(action)
+            if handler is not None:
+                func, takes_arg = handler
+                if takes_arg:
+                    func(item_name_input)
                 else:
-                    for i, item in enumerate(self.shop_inventory):
-                        print(f"{i+1}. {item.get_info()}")
-                print("----------------------")
-            
-            elif shop_command.startswith("buy"):
-                item_name_input = shop_command.split(" ", 1)[1] if " " in shop_command else ""
-                self._buy_item(item_name_input)
-            
-            elif shop_command.startswith("sell"):
-                item_name_input = shop_command.split(" ", 1)[1] if " " in shop_command else ""
-                self._sell_item(item_name_input)
-            
+                    func()
             elif shop_command == "exit":
                 print("Leaving the shop.")
                 break
             else:
                 print("Invalid shop command. Use 'list', 'buy [item]', 'sell [item]', or 'exit'.")
 
+    def _list_shop_stock(self):
+        out = ["\n--- Items for Sale ---"]
+        if not self.shop_inventory:
+            out.append("The shop is currently out of stock.")
+        else:
+            out.extend([f"{i}. {item.get_info()}" for i, item in enumerate(self.shop_inventory, 1)])
+        out.append("----------------------")
+        _emit(out)
+
     def _buy_item(self, item_name_input):
         """Allows the player to buy an item from the shop."""
         item_to_buy = self._fuzzy_find_item_in_lists(item_name_input, [self.shop_inventory])
@@ -1224,10 +1780,9 @@ class Game:
 
         if self.player.roubles >= item_to_buy.value:
             if self.player.get_current_weight() + item_to_buy.weight <= self.player.max_inventory_weight:
-                confirm = input(f"Buy {item_to_buy.name} for {item_to_buy.value}₽? (yes/no): ").lower().strip()
-                if confirm == "yes":
+                if _confirm(f"Buy {item_to_buy.name} for {item_to_buy.value}₽? (yes/no): "):
                     self.player.roubles -= item_to_buy.value
-                    self.player.inventory.append(item_to_buy)
+                    self.player.stash_item(item_to_buy)
                     self.shop_inventory.remove(item_to_buy) # Remove from shop stock
                     print(f"You bought {item_to_buy.name}. Roubles: {self.player.roubles}₽")
                 else:
@@ -1246,8 +1801,7 @@ class Game:
             return
 
         sell_price = int(item_to_sell.value * 0.6) # Trader buys for 60% of value
-        confirm = input(f"Sell {item_to_sell.name} for {sell_price}₽? (yes/no): ").lower().strip()
-        if confirm == "yes":
+        if _confirm(f"Sell {item_to_sell.name} for {sell_price}₽? (yes/no): "):
             self.player.roubles += sell_price
             self.player.remove_item(item_to_sell) # This also prints "You dropped..."
             # Add back to shop inventory (optional, for simple shop)
@@ -1259,37 +1813,38 @@ class Game:
     def _handle_storage_interface(self):
         """Manages the hideout storage."""
         print("\n--- Hideout Storage ---")
+        storage_handlers = self._storage_handlers
         while True:
-            current_storage_weight = sum(item.weight for item in self.hideout_storage)
-            print(f"Storage Weight: {current_storage_weight}/{self.max_hideout_storage_weight}kg")
+            print(f"Storage Weight: {self._storage_weight}/{self.max_hideout_storage_weight}kg")
             print("Storage Options: (list/put/take/examine [item]/exit)")
             storage_command = input("What would you like to do? ").lower().strip()
 
-            if storage_command.startswith("list"):
-                print("\n--- Items in Storage ---")
-                if not self.hideout_storage:
-                    print("Storage is empty.")
+            action, _, item_name_input = storage_command.partition(" ")
+            handler = storage_handlers.get(action)
+            if handler is not None:
+                func, takes_arg = handler
+                if takes_arg:
+                    func(item_name_input)
                 else:
-                    for i, item in enumerate(self.hideout_storage):
-                        print(f"{i+1}. {item.get_info()}")
-                print("------------------------")
-            
-            elif storage_command == "put":
-                self._put_item_in_storage()
-            
-            elif storage_command == "take":
-                self._take_item_from_storage()
-            
-            elif storage_command.startswith("examine"):
-                item_name_input = storage_command.split(" ", 1)[1] if " " in storage_command else ""
-                self.examine_item_in_hideout(item_name_input, from_storage=True)
-
+                    func()
             elif storage_command == "exit":
                 print("Leaving storage.")
                 break
             else:
                 print("Invalid storage command. Use 'list', 'put', 'take', 'examine [item]', or 'exit'.")
 
+    def _list_storage(self):
+        out = ["\n--- Items in Storage ---"]
+        if not self.hideout_storage:
+            out.append("Storage is empty.")
+        else:
+            out.extend([f"{i}. {item.get_info()}" for i, item in enumerate(self.hideout_storage, 1)])
+        out.append("------------------------")
+        _emit(out)
+
+    def _examine_in_storage(self, item_name_input):
+        self.examine_item_in_hideout(item_name_input, from_storage=True)
+
     def _put_item_in_storage(self):
         """Allows the player to move multiple items from inventory to hideout storage."""
         while True:
@@ -1305,36 +1860,32 @@ class Game:
                 continue
             
             # Prevent putting equipped items into storage
-            if item_to_put == self.player.equipped_weapon or \
-               item_to_put == self.player.equipped_armor or \
-               item_to_put == self.player.equipped_helmet:
+            if self.player.is_equipped(item_to_put):
                 print(f"You cannot put {item_to_put.name} into storage while it is equipped. Unequip it first.")
                 continue
 
-            current_storage_weight = sum(item.weight for item in self.hideout_storage)
-            if current_storage_weight + item_to_put.weight <= self.max_hideout_storage_weight:
-                self.player.inventory.remove(item_to_put) # Explicitly remove the instance
-                self.hideout_storage.append(item_to_put)
+            if self._storage_weight + item_to_put.weight <= self.max_hideout_storage_weight:
+                self.player.unstash_item(item_to_put) # Explicitly remove the instance
+                self._storage_add(item_to_put)
                 print(f"You put {item_to_put.name} into storage.")
             else:
                 print(f"Hideout storage is too full. Max weight: {self.max_hideout_storage_weight}kg.")
             
             # This loop continues until 'cancel' is typed
-            print(f"Current storage weight: {sum(item.weight for item in self.hideout_storage)}/{self.max_hideout_storage_weight}kg")
+            print(f"Current storage weight: {self._storage_weight}/{self.max_hideout_storage_weight}kg")
             print(f"Current inventory weight: {self.player.get_current_weight()}/{self.player.max_inventory_weight}kg")
 
 
     def _take_item_from_storage(self):
         """Allows the player to move multiple items from hideout storage to inventory."""
         while True:
-            print("\n--- Items in Storage ---")
             if not self.hideout_storage:
-                print("Storage is empty.")
+                print("\n--- Items in Storage ---\nStorage is empty.")
                 break
-            else:
-                for i, item in enumerate(self.hideout_storage):
-                    print(f"{i+1}. {item.get_info()}")
-            print("------------------------")
+            out = ["\n--- Items in Storage ---"]
+            out.extend([f"{i}. {item.get_info()}" for i, item in enumerate(self.hideout_storage, 1)])
+            out.append("------------------------")
+            _emit(out)
 
             item_name_input = input("Enter the name of the item to take from storage (or 'cancel' to finish): ").strip().lower()
             if item_name_input == 'cancel':
@@ -1347,14 +1898,14 @@ class Game:
                 continue
             
             if self.player.get_current_weight() + item_to_take.weight <= self.player.max_inventory_weight:
-                self.hideout_storage.remove(item_to_take) # Explicitly remove the instance
-                self.player.inventory.append(item_to_take)
+                self._storage_remove(item_to_take) # Explicitly remove the instance
+                self.player.stash_item(item_to_take)
                 print(f"You took {item_to_take.name} from storage.")
             else:
                 print(f"Your inventory is too full to take {item_to_take.name}.")
             
             # This loop continues until 'cancel' is typed
-            print(f"Current storage weight: {sum(item.weight for item in self.hideout_storage)}/{self.max_hideout_storage_weight}kg")
+            print(f"Current storage weight: {self._storage_weight}/{self.max_hideout_storage_weight}kg")
             print(f"Current inventory weight: {self.player.get_current_weight()}/{self.player.max_inventory_weight}kg")
 
     def _equip_item_in_hideout(self, item_name_input):
@@ -1365,12 +1916,7 @@ class Game:
             print(f"You don't have '{item_name_input}' in your inventory to equip, or your input was ambiguous.")
             return
 
-        if isinstance(found_item, Weapon):
-            self.player.equip_weapon(found_item)
-        elif isinstance(found_item, Armor):
-            self.player.equip_armor(found_item)
-        else:
-            print(f"{found_item.name} cannot be equipped.")
+        found_item.equip_on(self.player)
 
     def _remove_equipped_item_in_hideout(self, item_name_input):
         """Allows the player to remove an equipped item and put it back into inventory."""
@@ -1378,13 +1924,14 @@ class Game:
         target_slot = None
 
         # Check all equipped slots for a match
-        if self.player.equipped_weapon and self.player.equipped_weapon.name.lower().startswith(item_name_input.lower()):
+        prefix = item_name_input.lower()
+        if self.player.equipped_weapon and self.player.equipped_weapon._name_lc.startswith(prefix):
             target_item = self.player.equipped_weapon
             target_slot = "weapon"
-        elif self.player.equipped_armor and self.player.equipped_armor.name.lower().startswith(item_name_input.lower()):
+        elif self.player.equipped_armor and self.player.equipped_armor._name_lc.startswith(prefix):
             target_item = self.player.equipped_armor
             target_slot = "armor"
-        elif self.player.equipped_helmet and self.player.equipped_helmet.name.lower().startswith(item_name_input.lower()):
+        elif self.player.equipped_helmet and self.player.equipped_helmet._name_lc.startswith(prefix):
             target_item = self.player.equipped_helmet
             target_slot = "helmet"
         
@@ -1397,20 +1944,10 @@ class Game:
             print(f"Your inventory is too full to unequip {target_item.name}.")
             return
 
-        # Add the currently equipped item to inventory
-        self.player.inventory.append(target_item)
-
-        # Set the equipped slot to None and adjust stats
-        if target_slot == "weapon":
-            self.player.equipped_weapon = None
-            self.player.damage = 5 # Reset base damage if no weapon is equipped
-            print(f"You unequipped {target_item.name}.")
-        elif target_slot == "armor":
-            self.player.equipped_armor = None
-            print(f"You unequipped {target_item.name}.")
-        elif target_slot == "helmet":
-            self.player.equipped_helmet = None
-            print(f"You unequipped {target_item.name}.")
+        # Add the currently equipped item to inventory and empty its slot
+        self.player.stash_item(target_item)
+        self.player.clear_slot(target_slot)
+        print(f"You unequipped {target_item.name}.")
 
     def examine_item_in_hideout(self, item_name_input, from_storage=False):
         """Examines an item from player inventory or hideout storage."""
@@ -1420,14 +1957,7 @@ class Game:
                 print(f"'{item_name_input}' is not in your hideout storage, or your input was ambiguous.")
                 return
         else: # Check player inventory and equipped items
-            player_accessible_items = list(self.player.inventory)
-            if self.player.equipped_weapon:
-                player_accessible_items.append(self.player.equipped_weapon)
-            if self.player.equipped_armor:
-                player_accessible_items.append(self.player.equipped_armor)
-            if self.player.equipped_helmet:
-                player_accessible_items.append(self.player.equipped_helmet)
-            found_item = self._fuzzy_find_item_in_lists(item_name_input, [player_accessible_items])
+            found_item = self._fuzzy_find_item_in_lists(item_name_input, self.player.accessible_items())
             if not found_item:
                 print(f"You don't have '{item_name_input}' to examine, or your input was ambiguous.")
                 return
@@ -1446,14 +1976,12 @@ class Game:
         self._save_hideout_state(save_equipped_items=False)
         self.in_hideout = False
         self.raid_timer = 100 # Reset timer for new raid
-        self.player.current_health = self.player.max_health # Full health for raid start
-        self.player.current_stamina = self.player.max_stamina # Full stamina
-        self.player.is_bleeding = False # No bleeding at start
-        self.current_location = random.choice(list(self.map.values())) # Start at a random location
+        self.player.reset_for_raid()
+        self.current_location = random.choice(self._locations) # Start at a random location
         # Reset visited status for all locations for a fresh raid experience
-        for loc in self.map.values():
-            loc.visited = False
-            loc.enemies = [] # Clear enemies from previous raid
+        self._visited_mask = 0
+        for loc in self._locations:
+            loc.clear_enemies() # Clear enemies from previous raid
             # Re-add some static loot/containers if desired, or let _spawn_random_enemies handle it
             # For simplicity, current static loot is only added once in _initialize_game_state.
             # For dynamic loot, you'd re-populate containers here.
@@ -1464,8 +1992,7 @@ class Game:
 
     def _reset_game_data(self):
         """Deletes the save file and resets game state to initial values."""
-        confirm = input("Are you sure you want to reset all game data? This cannot be undone! (yes/no): ").lower().strip()
-        if confirm == "yes":
+        if _confirm("Are you sure you want to reset all game data? This cannot be undone! (yes/no): "):
             if os.path.exists("hideout_data.json"):
                 try:
                     os.remove("hideout_data.json")
@@ -1477,7 +2004,8 @@ class Game:
             
             # Reset player and game state to initial values
             self.player = Player()
-            self.hideout_storage = []
+            self._take_damage = self.player.take_damage
+            self._set_storage([])
             self.raid_count = 0
             self.in_hideout = True
             self.game_over = True # End current game loop
@@ -1486,29 +2014,18 @@ class Game:
             print("Game data reset cancelled.")
 
 
+    def _display_inventory(self):
+        self.player.display_inventory() # Looked up per call: _reset_game_data replaces the player
+
+    def _display_stats(self):
+        self.player.display_stats()
+
     def display_help(self):
         """Displays available commands (context-sensitive)."""
         if self.in_hideout:
             self.display_hideout_help()
         else:
-            print("\n--- Raid Commands ---")
-            print("move [direction] (or n/e/s/w/ne/nw/se/sw) - Move to an adjacent location.")
-            print("look (or l) - Re-examine your current location.")
-            print("get [item name] - Pick up an item from the ground.")
-            print("drop [item name] - Drop an item from your inventory.")
-            print("equip [item name] - Equip a weapon, body armor, or helmet from your inventory.")
-            print("use [item name] - Use a consumable item from your inventory.")
-            print("attack [enemy name] - Attack an enemy in the current location.")
-            print("inventory (or inv) - View your inventory.")
-            print("stats (or stat) - View your player stats.")
-            print("search [container name] - Search a container in the current location.")
-            print("examine [item name] (or ex) - View detailed information about an item in your inventory.")
-            print("rest - Take a moment to recover stamina.")
-            print("flee [direction] - Attempt to escape combat in a specific direction.")
-            print("extract - Attempt to extract from the raid.")
-            print("help (or h) - Display this list of commands.")
-            print("quit (or q) - Exit the game.")
-            print("--------------------------")
+            print(_RAID_HELP_TEXT)
 
     def move_player(self, direction):
         """Moves the player to a new location if the exit exists and initiates combat if enemies are present."""
@@ -1517,8 +2034,8 @@ class Game:
             print(f"You don't have enough stamina to move! You need {stamina_cost} stamina.")
             return False
 
-        if direction in self.current_location.exits:
-            new_location = self.current_location.exits[direction]
+        new_location = self.current_location.get_exit(direction)
+        if new_location is not None:
             print(f"Moving {direction} to {new_location.name}...")
             self.player.current_stamina -= stamina_cost
             self.current_location = new_location
@@ -1543,7 +2060,7 @@ class Game:
 
     def get_item(self, item_name_input):
         """Attempts to pick up an item from the current location using fuzzy matching."""
-        found_item = self._fuzzy_find_item_in_lists(item_name_input, [self.current_location.items])
+        found_item = self._fuzzy_find_item_in_lists(item_name_input, [self.current_location.items or []])
         
         if found_item:
             if self.player.add_item(found_item):
@@ -1560,9 +2077,7 @@ class Game:
             return
 
         # Prevent dropping equipped items
-        if found_item == self.player.equipped_weapon or \
-           found_item == self.player.equipped_armor or \
-           found_item == self.player.equipped_helmet:
+        if self.player.is_equipped(found_item):
             print(f"You cannot drop {found_item.name} while it is equipped.")
             return
 
@@ -1576,12 +2091,7 @@ class Game:
         found_item = self._fuzzy_find_item_in_lists(item_name_input, [self.player.inventory])
 
         if found_item:
-            if isinstance(found_item, Weapon):
-                self.player.equip_weapon(found_item)
-            elif isinstance(found_item, Armor):
-                self.player.equip_armor(found_item)
-            else:
-                print(f"{found_item.name} cannot be equipped.")
+            found_item.equip_on(self.player)
         else:
             print(f"You don't have '{item_name_input}' in your inventory to equip, or your input was ambiguous.")
 
@@ -1596,15 +2106,7 @@ class Game:
 
     def examine_item(self, item_name_input):
         """Displays detailed information about an item using fuzzy matching."""
-        player_accessible_items = list(self.player.inventory)
-        if self.player.equipped_weapon:
-            player_accessible_items.append(self.player.equipped_weapon)
-        if self.player.equipped_armor:
-            player_accessible_items.append(self.player.equipped_armor)
-        if self.player.equipped_helmet:
-            player_accessible_items.append(self.player.equipped_helmet)
-
-        found_item = self._fuzzy_find_item_in_lists(item_name_input, [player_accessible_items])
+        found_item = self._fuzzy_find_item_in_lists(item_name_input, self.player.accessible_items())
 
         if found_item:
             print(f"\n--- Examining {found_item.name} ---")
@@ -1615,7 +2117,7 @@ class Game:
 
     def search_container(self, container_name_input):
         """Searches a container in the current location for loot using fuzzy matching."""
-        target_container = self._fuzzy_find_item_in_lists(container_name_input, [self.current_location.containers])
+        target_container = self._fuzzy_find_item_in_lists(container_name_input, [self.current_location.containers or []])
         
         if not target_container:
             print(f"There is no '{container_name_input}' here to search, or your input was ambiguous.")
@@ -1630,18 +2132,23 @@ class Game:
             target_container.is_looted = True
             return
 
-        print(f"You search the {target_container.name} and find:")
-        for item in list(target_container.items):
-            if self.player.add_item(item):
-                target_container.items.remove(item)
-            else:
-                print(f"You couldn't pick up {item.name} due to inventory weight.")
+        out = [f"You search the {target_container.name} and find:"]
+        self.player.buffer_messages(out) # Pickup messages join this listing and go out in one write
+        add_item = self.player.add_item
+        kept = [] # Items that didn't fit; the container keeps them, still in their original order
+        for item in target_container.items:
+            if not add_item(item):
+                kept.append(item)
+                out.append(f"You couldn't pick up {item.name} due to inventory weight.")
+        self.player.buffer_messages(None)
+        target_container.items = kept
         
-        if not target_container.items:
+        if not kept:
             target_container.is_looted = True
-            print(f"The {target_container.name} is now empty.")
+            out.append(f"The {target_container.name} is now empty.")
         else:
-            print(f"Some items remain in the {target_container.name}.")
+            out.append(f"Some items remain in the {target_container.name}.")
+        _emit(out)
 
     def rest_player(self):
         """Restores player's stamina."""
@@ -1655,11 +2162,7 @@ class Game:
 
     def attack_enemy(self, enemy_name):
         """Initiates combat with a specified enemy."""
-        target_enemy = None
-        for enemy in self.current_location.enemies:
-            if enemy.is_alive and enemy.name.lower() == enemy_name.lower():
-                target_enemy = enemy
-                break
+        target_enemy = self.current_location.find_enemy(enemy_name)
 
         if not target_enemy:
             print(f"No '{enemy_name}' found here.")
@@ -1669,7 +2172,7 @@ class Game:
             print("You need to equip a weapon to attack!")
             return
 
-        print(f"\n--- Combat initiated with {Colors.RED}{target_enemy.name}{Colors.RESET}! ---")
+        print(f"\n--- Combat initiated with {target_enemy.colored_name}! ---")
         combat_fled = False
         while self.player.is_alive and target_enemy.is_alive:
             combat_fled = self.combat_round(target_enemy)
@@ -1680,328 +2183,205 @@ class Game:
                 print("You have been killed in action. Raid failed!")
                 break
             if not target_enemy.is_alive:
-                print(f"{Colors.RED}{target_enemy.name}{Colors.RESET} has been neutralized!")
+                print(f"{target_enemy.colored_name} has been neutralized!")
                 self.current_location.remove_enemy(target_enemy)
                 self._handle_enemy_loot(target_enemy)
                 break
-            time.sleep(1)
+            if self.combat_pace:
+                sys.stdout.flush() # Show the round before pausing on it
+                time.sleep(self.combat_pace)
         print("--- Combat End ---")
 
 
     def combat_round(self, enemy):
         """Handles a single round of combat."""
+        player = self.player
         print("\n--- Your Turn ---")
-        action_choice = ""
-        valid_combat_choices = ["head", "body", "flee"] 
-        while True:
-            player_input = input(f"Choose your action (head/body/flee)? [{self.player._get_health_status()}] ").lower().strip()
-            
-            matching_choices = [choice for choice in valid_combat_choices if choice.startswith(player_input)]
-
-            if len(matching_choices) == 1:
-                action_choice = matching_choices[0]
-                print(f"(Autocompleted to: {action_choice})")
-                break
-            elif len(matching_choices) > 1:
-                print(f"Ambiguous choice. Did you mean: {', '.join(matching_choices)}?")
-            else:
-                print("Invalid choice. Please choose 'head', 'body', or 'flee'.")
+        action_choice = _prompt_choice(f"Choose your action (head/body/flee)? [{player._get_health_status()}] ",
+                                       _COMBAT_CHOICE_PREFIXES, "choice", "Invalid choice. Please choose 'head', 'body', or 'flee'.")
 
         if action_choice == "flee":
             return self._attempt_flee(enemy)
 
-        player_damage = self.player.damage + random.randint(-5, 5)
+        rand = random.random
+        randint = random.randint
+        cname = enemy.colored_name
+        out = []
+        say = out.append
+        player_damage = player.damage + randint(-5, 5)
         
         base_hit_chance = 0.75
         current_location_range = self.current_location.range_type
-        weapon_effective_range = self.player.equipped_weapon.effective_range_type
-
-        range_modifier = 0
-        if current_location_range == "very_short":
-            if weapon_effective_range == "very_short": range_modifier += 0.20
-            elif weapon_effective_range == "short": range_modifier += 0.10
-            elif weapon_effective_range == "medium": range_modifier -= 0.05
-            elif weapon_effective_range == "long": range_modifier -= 0.15
-        elif current_location_range == "short":
-            if weapon_effective_range == "very_short": range_modifier -= 0.10
-            elif weapon_effective_range == "short": range_modifier += 0.15
-            elif weapon_effective_range == "medium": range_modifier += 0.05
-            elif weapon_effective_range == "long": range_modifier -= 0.10
-        elif current_location_range == "medium":
-            if weapon_effective_range == "very_short": range_modifier -= 0.15
-            elif weapon_effective_range == "short": range_modifier -= 0.05
-            elif weapon_effective_range == "medium": range_modifier += 0.10
-            elif weapon_effective_range == "long": range_modifier += 0.05
-        elif current_location_range == "long":
-            if weapon_effective_range == "very_short": range_modifier -= 0.30
-            elif weapon_effective_range == "short": range_modifier -= 0.20
-            elif weapon_effective_range == "medium": range_modifier -= 0.10
-            elif weapon_effective_range == "long": range_modifier += 0.20
-
-        final_hit_chance = base_hit_chance + range_modifier
-        final_hit_chance = max(0.1, min(0.95, final_hit_chance))
+        final_hit_chance = player._shot_resolver(current_location_range, base_hit_chance)
 
         target_part = action_choice
 
-        actual_hit_location = None
-        
-        player_hit = False
-        if target_part == "head":
-            headshot_miss_penalty = 0.30
-            if random.random() < (final_hit_chance - headshot_miss_penalty):
-                if random.random() < 0.4:
-                    actual_hit_location = "head"
-                    print(f"You aimed for the head and hit the head!")
-                else:
-                    actual_hit_location = "body"
-                    print(f"You aimed for the head but hit the body instead!")
-                player_hit = True
-            else:
-                print(f"You aimed for the head but missed {Colors.RED}{enemy.name}{Colors.RESET} entirely!")
+        actual_hit_location = _resolve_shot(final_hit_chance, target_part == "head", rand(), rand())
+        player_hit = actual_hit_location is not None
+        if player_hit:
+            say(_PLAYER_HIT_LINES[target_part, actual_hit_location])
         else:
-            if random.random() < final_hit_chance:
-                actual_hit_location = "body"
-                print(f"You aimed for the body and hit the body!")
-                player_hit = True
-            else:
-                print(f"You aimed for the body but missed {Colors.RED}{enemy.name}{Colors.RESET} entirely!")
+            say(_PLAYER_MISS_LINES[target_part] % cname)
 
         if player_hit:
             player_damage_for_enemy = player_damage
             if actual_hit_location == "head":
-                player_damage_for_enemy = int(player_damage_for_enemy * 2)
-                print("Critical hit! Headshot!")
+                player_damage_for_enemy += player_damage_for_enemy
+                say("Critical hit! Headshot!")
             
+            _emit(out) # take_damage may print a critical-hit notice of its own
             actual_damage_dealt = enemy.take_damage(player_damage_for_enemy, hit_location=actual_hit_location)
-            print(f"You attack {Colors.RED}{enemy.name}{Colors.RESET} with your {self.player.equipped_weapon.name}, and hit!")
+            say(f"You attack {cname} with your {player.equipped_weapon.name}, and hit!")
             
             if current_location_range == "close":
-                print(f"{Colors.RED}{enemy.name}{Colors.RESET} (Condition: {enemy.get_condition()})")
+                say(_CONDITION_LINE % (cname, enemy.get_condition()))
             else:
-                print(f"{Colors.RED}{enemy.name}{Colors.RESET} is at {current_location_range} range. You can't tell their exact condition.")
+                say(f"{cname} is at {current_location_range} range. You can't tell their exact condition.")
 
             if not enemy.is_alive:
+                _emit(out)
                 return False
 
-        print("--- Enemy's Turn ---")
-        enemy_damage = enemy.damage + random.randint(-3, 3)
-        
-        enemy_final_hit_chance = enemy.base_hit_chance
-        enemy_range_modifier = 0
-        
-        if current_location_range == "very_short": enemy_range_modifier += 0.10
-        elif current_location_range == "short": enemy_range_modifier += 0.05
-        elif current_location_range == "long": enemy_range_modifier -= 0.10
+        say("--- Enemy's Turn ---")
+        if self._enemy_attack(enemy, enemy.hit_chance, out) is not None:
+            player.restore_stamina(5)
+        return False
 
-        enemy_final_hit_chance += enemy_range_modifier
-        enemy_final_hit_chance = max(0.1, min(0.95, enemy_final_hit_chance))
+    def _enemy_attack(self, enemy, hit_chance, out, counter=False):
+        """
+        Resolves one enemy attack on the player, appending its messages to out and writing them.
+        A counter attack (after a failed flee) lands wherever it was aimed and is reported more tersely.
+        Returns the damage the player took, or None if the attack missed.
+        """
+        rand = random.random
+        say = out.append
+        cname = enemy.colored_name
+        enemy_damage = enemy.damage + random.randint(-3, 3)
+        enemy_aim_target = "head" if rand() < 0.5 else "body"
 
-        enemy_aim_target = random.choice(["head", "body"])
-        actual_enemy_hit_location = None
+        if rand() >= hit_chance:
+            say((_COUNTER_MISS_LINE if counter else _ENEMY_MISS_LINE) % cname)
+            say(_HEALTH_LINE % self.player._get_health_status())
+            _emit(out)
+            return None
 
-        if random.random() > enemy_final_hit_chance:
-            print(f"{Colors.RED}{enemy.name}{Colors.RESET} attacks you but misses!")
-            print(f"Your Health: {self.player._get_health_status()}")
-            return False
-
-        if enemy_aim_target == "head":
-            if random.random() < 0.3:
-                actual_enemy_hit_location = "head"
-                print(f"{Colors.RED}{enemy.name}{Colors.RESET} aims for your head and hits!")
+        if counter:
+            actual_enemy_hit_location = enemy_aim_target
+        else:
+            if enemy_aim_target == "head":
+                actual_enemy_hit_location = "head" if rand() < 0.3 else "body"
             else:
                 actual_enemy_hit_location = "body"
-                print(f"{Colors.RED}{enemy.name}{Colors.RESET} aims for your head but hits your body instead!")
-        else:
-            actual_enemy_hit_location = "body"
-            print(f"{Colors.RED}{enemy.name}{Colors.RESET} aims for your body and hits!")
+            say(_ENEMY_AIM_LINES[enemy_aim_target, actual_enemy_hit_location] % cname)
 
         enemy_damage_to_player = enemy_damage
         if actual_enemy_hit_location == "head":
-            enemy_damage_to_player = int(enemy_damage_to_player * 2)
-            print("Critical hit! Headshot!")
+            enemy_damage_to_player += enemy_damage_to_player
+            say("Critical hit! Headshot!")
 
+        _emit(out) # take_damage may print a bleeding notice of its own
         actual_damage_taken = self.player.take_damage(enemy_damage_to_player, hit_location=actual_enemy_hit_location)
-        print(f"{Colors.RED}{enemy.name}{Colors.RESET} attacks you, dealing {actual_damage_taken} damage.")
-        print(f"Your Health: {self.player._get_health_status()}")
-        self.player.restore_stamina(5)
-        return False
+        say((_COUNTER_HIT_LINE if counter else _ENEMY_HIT_LINE) % (cname, actual_damage_taken))
+        say(_HEALTH_LINE % self.player._get_health_status())
+        _emit(out)
+        return actual_damage_taken
 
     def _attempt_flee(self, enemy):
         """Attempts to flee from combat."""
-        print("\n--- Attempting to Flee ---")
-        print("\n--- Available Exits ---")
-        if not self.current_location.exits:
-            print("No immediate exits from this combat zone.")
+        rand = random.random
+        out = ["\n--- Attempting to Flee ---", "\n--- Available Exits ---"]
+        say = out.append
+        if not self.current_location.get_exit_directions():
+            say("No immediate exits from this combat zone.")
         else:
-            for direction, location in self.current_location.exits.items():
-                print(f"- {direction.capitalize()} to {location.name}")
-        print("-----------------------")
+            say(self.current_location.get_exits_text())
+        say("-----------------------")
+        _emit(out)
 
-        flee_direction = ""
-        
-        available_exits = list(self.current_location.exits.keys())
-        while True:
-            flee_input = input(f"Which direction do you want to flee? ({'/'.join(available_exits)}) ").lower().strip()
-            matching_directions = [direction for direction in available_exits if direction.startswith(flee_input)]
-
-            if len(matching_directions) == 1:
-                flee_direction = matching_directions[0]
-                print(f"(Autocompleted to: {flee_direction})")
-                break
-            elif len(matching_directions) > 1:
-                print(f"Ambiguous direction. Did you mean: {', '.join(matching_directions)}?")
-            else:
-                print("Invalid direction. Please choose an available exit.")
+        flee_prompt = f"Which direction do you want to flee? ({'/'.join(self.current_location.get_exit_directions())}) "
+        flee_direction = _prompt_choice(flee_prompt, self.current_location.get_exit_prefix_map(),
+                                        "direction", "Invalid direction. Please choose an available exit.")
 
         flee_chance = max(0.1, 0.8 - (self.player.get_current_weight() / self.player.max_inventory_weight) * 0.5)
         
-        print(f"Your chance to flee: {flee_chance*100:.0f}%")
+        say(f"Your chance to flee: {flee_chance*100:.0f}%")
 
-        if random.random() < flee_chance:
-            new_location = self.current_location.exits[flee_direction]
-            print(f"You successfully flee {flee_direction} to {new_location.name}!")
+        if rand() < flee_chance:
+            new_location = self.current_location.get_exit(flee_direction)
+            say(f"You successfully flee {flee_direction} to {new_location.name}!")
+            _emit(out)
             self.current_location = new_location
             self._spawn_random_enemies()
             self.player.restore_stamina(10)
             self.display_location()
             return True
         else:
-            print("Your escape attempt failed! You couldn't get away.")
-            print(f"--- {Colors.RED}{enemy.name}{Colors.RESET}'s Counter Attack! ---")
-            enemy_damage = enemy.damage + random.randint(-3, 3)
-            enemy_final_hit_chance = enemy.base_hit_chance
-            
-            if random.random() < enemy_final_hit_chance:
-                hit_location = random.choice(["head", "body"])
-                enemy_damage_to_player = enemy_damage
-                if hit_location == "head":
-                    enemy_damage_to_player = int(enemy_damage_to_player * 2)
-                    print("Critical hit! Headshot!")
-                actual_damage_taken = self.player.take_damage(enemy_damage_to_player, hit_location=hit_location)
-                print(f"{Colors.RED}{enemy.name}{Colors.RESET} lands a hit on you, dealing {actual_damage_taken} damage.")
-                print(f"Your Health: {self.player._get_health_status()}")
-            else:
-                print(f"{Colors.RED}{enemy.name}{Colors.RESET} tries to hit you but misses!")
-                print(f"Your Health: {self.player._get_health_status()}")
-            
+            say("Your escape attempt failed! You couldn't get away.")
+            say(f"--- {enemy.colored_name}'s Counter Attack! ---")
+            self._enemy_attack(enemy, enemy.base_hit_chance, out, counter=True)
             self.player.restore_stamina(5)
             return False
 
     def _handle_enemy_loot(self, enemy):
         """Adds enemy's loot to the current location."""
-        print(f"{Colors.RED}{enemy.name}{Colors.RESET} dropped some loot:")
-        
-        if enemy.equipped_weapon:
-            self.current_location.add_item(enemy.equipped_weapon)
-            print(f"- {enemy.equipped_weapon.name} (equipped weapon)")
-        if enemy.equipped_armor:
-            self.current_location.add_item(enemy.equipped_armor)
-            print(f"- {enemy.equipped_armor.name} (equipped body armor)")
-        if enemy.equipped_helmet:
-            self.current_location.add_item(enemy.equipped_helmet)
-            print(f"- {enemy.equipped_helmet.name} (equipped helmet)")
-
-        if enemy.loot_items:
-            for item in enemy.loot_items:
-                self.current_location.add_item(item)
-                print(f"- {item.name}")
-        
-        if not enemy.equipped_weapon and not enemy.equipped_armor and not enemy.equipped_helmet and not enemy.loot_items:
-            print(f"{Colors.RED}{enemy.name}{Colors.RESET} dropped nothing of value.")
+        gear = [(item, label) for item, label in ((enemy.equipped_weapon, "equipped weapon"),
+                                                  (enemy.equipped_armor, "equipped body armor"),
+                                                  (enemy.equipped_helmet, "equipped helmet")) if item]
+        loot_items = enemy.loot_items
+        if not (gear or loot_items):
+            print(f"{enemy.colored_name} dropped nothing of value.")
+            return
+
+        out = [f"{enemy.colored_name} dropped some loot:"]
+        out.extend([f"- {item.name} ({label})" for item, label in gear])
+        out.extend([f"- {item.name}" for item in loot_items])
+        dropped = [item for item, _ in gear]
+        dropped.extend(loot_items)
+
+        self.current_location.add_items(dropped)
+        enemy.release_loot() # The corpse may outlive this call (e.g. an ambush's fight list); don't let it pin the loot
+        _emit(out)
 
     def _spawn_random_enemies(self):
         """Randomly spawns basic scavs in unvisited locations, and occasionally in visited ones."""
         
-        spawned_in_current_location = False
-
-        for loc_name, location in self.map.items():
-            # Only spawn if no enemies are currently there and it's not an extraction point
-            if not location.enemies and not location.is_extraction_point:
-                # Higher chance in unvisited, moderate chance in visited
-                spawn_chance = 0.4 if not location.visited else 0.15
-                
-                # Increase spawn chance slightly for more populated areas like Dorms, Factory, Resort
-                if "Dormitories" in loc_name or "Factory" in loc_name or "Resort" in loc_name or "Military Base" in loc_name:
-                    spawn_chance += 0.2
-
-                if random.random() < spawn_chance:
-                    num_scavs = random.randint(1, 3) # Up to 3 scavs
+        spawn_messages = [] # Lurk notices for the current location, printed together at the end
+        visited_mask = self._visited_mask
+        archetypes = self._enemy_archetypes
+        thresholds = _ENEMY_ARCHETYPE_THRESHOLDS
+        common_loot = self.scav_common_loot
+        rand, randint, choice = random.random, random.randint, random.choice
+
+        for location in self._spawn_locations:
+            # Only spawn if no enemies are currently there
+            if not location.enemies:
+                # Higher chance in unvisited, moderate chance in visited, slightly more in populated areas
+                spawn_chance = (0.15 if visited_mask >> location.id & 1 else 0.4) + location.spawn_bonus
+
+                if rand() < spawn_chance:
+                    num_scavs = randint(1, 3) # Up to 3 scavs
                     for _ in range(num_scavs):
                         # Determine enemy type and gear
-                        enemy_type_roll = random.random()
-                        if enemy_type_roll < 0.15: # 15% chance for a heavily armored enemy (like a "Boss Guard")
-                            enemy_name = random.choice(["USEC PMC", "Elite Scav"]) # Renamed "Heavy Guard" to "USEC PMC"
-                            enemy_health = random.randint(150, 250)
-                            enemy_damage = random.randint(25, 35)
-                            enemy_defense = 0 # Base defense, armor adds
-                            enemy_base_hit_chance = 0.60
-
-                            enemy_loot = random.sample(self.scav_common_loot, random.randint(2, 4))
-                            # Corrected: Referencing self.svd and self.m4a1 directly
-                            equipped_weapon = random.choice(self.armored_scav_weapons + [self.svd, self.m4a1]) # Higher tier weapons
-                            enemy_loot.append(equipped_weapon)
-                            
-                            equipped_armor = random.choice([self.gen4_armor, self.kirasa_armor])
-                            equipped_helmet = random.choice([self.altyn_helmet, self.kolpak_helmet])
-
-                            new_enemy = Enemy(enemy_name, enemy_health, enemy_damage, enemy_defense, 
-                                              loot_items=enemy_loot, equipped_weapon=equipped_weapon,
-                                              equipped_armor=equipped_armor, equipped_helmet=equipped_helmet,
-                                              base_hit_chance=enemy_base_hit_chance)
-                            location.add_enemy(new_enemy)
-                            if location == self.current_location:
-                                print(f"A {Colors.RED}{enemy_name}{Colors.RESET} lurks nearby...")
-                                spawned_in_current_location = True
-                        elif enemy_type_roll < 0.40: # 25% chance for an Armored Scav
-                            enemy_name = "Armored Scav"
-                            enemy_health = random.randint(70, 120)
-                            enemy_damage = random.randint(18, 25)
-                            enemy_defense = 0 # Base defense, armor will add to this
-                            enemy_base_hit_chance = 0.55 # Increased slightly for more challenge
-
-                            # Armored Scav specific loot
-                            enemy_loot = random.sample(self.scav_common_loot, random.randint(1, 3))
-                            equipped_weapon = random.choice(self.armored_scav_weapons)
-                            enemy_loot.append(equipped_weapon) # Always drop a weapon
-                            
-                            # Ensure armored scavs have armor and possibly a helmet
-                            equipped_armor = random.choice(self.armored_scav_armor)
-                            equipped_helmet = random.choice(self.armored_scav_helmets)
-
-                            new_enemy = Enemy(enemy_name, enemy_health, enemy_damage, enemy_defense, 
-                                              loot_items=enemy_loot, equipped_weapon=equipped_weapon,
-                                              equipped_armor=equipped_armor, equipped_helmet=equipped_helmet,
-                                              base_hit_chance=enemy_base_hit_chance)
-                            location.add_enemy(new_enemy)
-                            if location == self.current_location:
-                                print(f"An {Colors.RED}{enemy_name}{Colors.RESET} lurks nearby...")
-                                spawned_in_current_location = True
-                        else: # Regular Scav (60% chance)
-                            enemy_name = "Scav"
-                            enemy_health = random.randint(40, 70)
-                            enemy_damage = random.randint(10, 18)
-                            enemy_defense = 0 # Base defense, armor will add to this
-                            enemy_base_hit_chance = 0.45 # Decreased for random enemies
-
-                            # Regular Scav specific loot
-                            enemy_loot = random.sample(self.scav_common_loot, random.randint(0, 2))
-                            equipped_weapon = random.choice(self.scav_weapons)
-                            enemy_loot.append(equipped_weapon) # Always drop a weapon
-
-                            # Scavs now only get lower-tier armor/helmets
-                            equipped_armor = random.choice(self.scav_armor_pieces)
-                            equipped_helmet = random.choice(self.scav_helmets)
-
-                            new_enemy = Enemy(enemy_name, enemy_health, enemy_damage, enemy_defense, 
-                                              loot_items=enemy_loot, equipped_weapon=equipped_weapon,
-                                              equipped_armor=equipped_armor, equipped_helmet=equipped_helmet,
-                                              base_hit_chance=enemy_base_hit_chance)
-                            location.add_enemy(new_enemy)
-                            if location == self.current_location:
-                                print(f"A {Colors.RED}{enemy_name}{Colors.RESET} lurks nearby...")
-                                spawned_in_current_location = True
-        if spawned_in_current_location:
-            print("You hear movement nearby...")
+                        (names, (min_health, max_health), (min_damage, max_damage), base_hit_chance,
+                         (min_loot, max_loot), weapons, armor, helmets, article) = archetypes[bisect_right(thresholds, rand())]
+                        enemy_name = names[0] if len(names) == 1 else choice(names) # A fixed name takes no random draw
+                        enemy_health = randint(min_health, max_health)
+                        enemy_damage = randint(min_damage, max_damage)
+
+                        enemy_loot = _sample_small(common_loot, randint(min_loot, max_loot))
+                        equipped_weapon = choice(weapons)
+                        enemy_loot.append(equipped_weapon) # Always drop a weapon
+
+                        new_enemy = Enemy(enemy_name, enemy_health, enemy_damage, 0, # Base defense, armor adds
+                                          loot_items=enemy_loot, equipped_weapon=equipped_weapon,
+                                          equipped_armor=choice(armor), equipped_helmet=choice(helmets),
+                                          base_hit_chance=base_hit_chance)
+                        location.add_enemy(new_enemy)
+                        if location == self.current_location:
+                            spawn_messages.append(f"{article} {new_enemy.colored_name} lurks nearby...")
+        if spawn_messages:
+            spawn_messages.append("You hear movement nearby...")
+            print("\n".join(spawn_messages))
 
     def check_extraction(self):
         """Checks if the player is at an extraction point and can extract."""
@@ -2025,21 +2405,24 @@ class Game:
         """Main game loop."""
         print("Welcome to Textract: Text-Based MUD!")
         print("Type 'help' for a list of commands.")
+        pacing_enabled = self.pacing_enabled
+        handle_input = self.handle_input
         
         while not self.game_over:
+            player = self.player # Re-read each turn: _reset_game_data replaces the player
             if self.in_hideout:
-                print(f"\n--- You are in your Hideout --- (Roubles: {self.player.roubles}₽, Successful Raids: {self.raid_count})")
+                print(f"\n--- You are in your Hideout --- (Roubles: {player.roubles}₽, Successful Raids: {self.raid_count})")
                 command = input("\nWhat do you do in the hideout? ").strip()
             else:
                 print(f"\n--- Raid Timer: {self.raid_timer} actions remaining ---")
                 command = input("\nWhat do you do, PMC? ").strip()
             
             if command:
-                self.handle_input(command)
+                handle_input(command)
             else:
                 print("Please enter a command.")
 
-            if self.player.current_health <= 0:
+            if self.player.current_health <= 0: # self.player, not player: a hideout reset may have replaced it
                 self.game_over = True
                 print("\nYour health has dropped to zero. You are KIA. Raid failed!")
                 print("Your progress is lost as you did not extract.") # Indicate loss on death
@@ -2047,7 +2430,10 @@ class Game:
                 # The _save_hideout_state(save_equipped_items=False) call at the start of the raid
                 # ensures that equipped items and inventory are not part of the save file if the player dies.
 
-            time.sleep(0.5)
+            sys.stdout.flush() # One flush per command; show the output before the pacing pause
+
+            if pacing_enabled:
+                time.sleep(0.5)
 
         if self.game_won and self.in_hideout: # Game won implies successful extraction
             print("\nCongratulations, PMC! You survived the raid and made it back to your hideout!")
@@ -2056,5 +2442,9 @@ class Game:
 
 
 if __name__ == "__main__":
-    game = Game()
+    # A tty stdout is line buffered, which flushes on every printed line; run() flushes once per command instead.
+    # input() still flushes before each prompt, so nothing is ever left unseen.
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+    game = Game(pacing=not os.environ.get("TEXTRACT_HEADLESS")) # Set TEXTRACT_HEADLESS=1 for scripted runs without pauses
     game.run()